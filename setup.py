@@ -9,13 +9,29 @@ setup(
         "nltk>=3.8.1",
         "sentence-transformers>=2.2.2",
         "torch>=2.1.0",
-        "scikit-learn>=1.3.0",
         "numpy>=1.24.3",
         "requests>=2.31.0",
         "pyyaml>=6.0",
         "fastapi>=0.110.0",
         "uvicorn>=0.29.0",
     ],
+    extras_require={
+        'fast': [
+            "blingfire>=0.1.8",
+            "orjson>=3.8.0",
+        ],
+        # Exported inference backends (models.embedding_backend)
+        'onnx': [
+            "sentence-transformers[onnx]>=3.2",
+        ],
+        'openvino': [
+            "sentence-transformers[openvino]>=3.2",
+        ],
+        'dev': [
+            "pytest>=7.0",
+            "pytest-xdist>=3.0",
+        ],
+    },
     python_requires=">=3.8",
     entry_points={
         'console_scripts': [
@@ -1,15 +1,98 @@
 import arxiv
+import copy
 import datetime
-from typing import List, Dict, Optional
+import operator
+from typing import Dict, Iterator, List, Optional
 import logging
 
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.utils.ttl_cache import TTLCache
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# arXiv API limit on results per request
+MAX_PAGE_SIZE = 2000
+
+_RESULT_FIELDS = operator.attrgetter(
+    'title', 'summary', 'pdf_url', 'published', 'updated',
+    'entry_id', 'categories', 'doi', 'comment', 'authors',
+)
+
+
+def _to_dict(result: arxiv.Result) -> Dict:
+    """Convert an arxiv.Result into an article metadata dictionary."""
+    title, summary, pdf_url, published, updated, entry_id, categories, doi, comment, authors = \
+        _RESULT_FIELDS(result)
+    return {
+        'title': title,
+        'authors': [author.name for author in authors],
+        'abstract': summary,
+        'pdf_url': pdf_url,
+        'published': published,
+        'updated': updated,
+        'arxiv_id': entry_id.rsplit('/', 1)[-1],
+        'categories': categories,
+        'doi': doi,
+        'comment': comment,
+    }
+
+
+class _PooledArxivClient(arxiv.Client):
+    """arxiv.Client whose session keeps one pooled keep-alive connection to arXiv."""
+
+    def __init__(self, page_size: int = 100, delay_seconds: float = 3.0, num_retries: int = 3):
+        super().__init__(page_size=page_size, delay_seconds=delay_seconds, num_retries=num_retries)
+        # Retries stay with arxiv.Client, which honours delay_seconds between
+        # attempts; the adapter only pools the connection.
+        session = getattr(self, "_session", None)
+        if not isinstance(session, requests.Session):
+            logger.debug("arxiv.Client has no requests session to pool; using its defaults")
+            return
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        session.headers["Connection"] = "keep-alive"
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+    def _format_url(self, search: arxiv.Search, start: int, page_size: int) -> str:
+        # Never request more entries than the search still needs, so small
+        # searches fetch exactly max_results and the last page is trimmed.
+        if search.max_results is not None:
+            page_size = max(1, min(page_size, search.max_results - start))
+        return super()._format_url(search, start, page_size)
+
+
 class ArxivScraper:
-    def __init__(self):
-        """Initialize the ArxivScraper."""
-        self.client = arxiv.Client()
+    def __init__(
+        self,
+        client: Optional[arxiv.Client] = None,
+        cache_ttl: Optional[float] = 3600.0,
+        cache_size: int = 128,
+        page_size: int = 100,
+    ):
+        """
+        Initialize the ArxivScraper.
+
+        Args:
+            client (arxiv.Client): Optional client to use. Defaults to a pooled
+                client that reuses one connection across page fetches, so keep
+                a single scraper around to benefit from it.
+            cache_ttl (float): Seconds a search or lookup result is reused
+                before arXiv is queried again. None never expires entries.
+            cache_size (int): Maximum number of cached searches and lookups
+                each. 0 disables caching.
+            page_size (int): Results requested per API call, capped at arXiv's
+                limit of 2000. Larger pages mean fewer rate-limited round-trips
+                for big searches.
+        """
+        self.client = client or _PooledArxivClient(
+            page_size=min(page_size, MAX_PAGE_SIZE),
+            delay_seconds=3.0,
+        )
+        self._search_cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self._article_cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
 
     def search_articles(
         self,
@@ -34,6 +117,36 @@ class ArxivScraper:
         Returns:
             List[Dict]: List of article metadata dictionaries
         """
+        articles = list(self.iter_articles(
+            query=query,
+            max_results=max_results,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            date_from=date_from,
+            date_to=date_to,
+        ))
+        logger.info(f"Successfully retrieved {len(articles)} articles")
+        return articles
+
+    def iter_articles(
+        self,
+        query: str,
+        max_results: int = 100,
+        sort_by: arxiv.SortCriterion = arxiv.SortCriterion.Relevance,
+        sort_order: arxiv.SortOrder = arxiv.SortOrder.Descending,
+        date_from: Optional[datetime.datetime] = None,
+        date_to: Optional[datetime.datetime] = None,
+    ) -> Iterator[Dict]:
+        """
+        Search arXiv and yield each article as soon as its page arrives.
+
+        Takes the same arguments as search_articles. Lets callers start
+        processing the first page while later pages are still being fetched.
+        The result set is cached only once it has been consumed completely.
+
+        Yields:
+            Dict: Article metadata dictionary
+        """
         try:
             # Append date range filter to query using arXiv Lucene syntax
             full_query = query
@@ -43,6 +156,14 @@ class ArxivScraper:
                 date_filter = f"submittedDate:[{lo} TO {hi}]"
                 full_query = f"({query}) AND {date_filter}"
 
+            cache_key = (full_query, max_results, sort_by, sort_order)
+            cached = self._search_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Using cached results for query: '{full_query}'")
+                for article in cached:
+                    yield copy.deepcopy(article)
+                return
+
             # Construct the search query
             search = arxiv.Search(
                 query=full_query,
@@ -51,28 +172,15 @@ class ArxivScraper:
                 sort_order=sort_order
             )
 
-            # Execute the search
-            results = list(self.client.results(search))
-            
-            # Convert results to dictionaries
-            articles = []
-            for result in results:
-                article = {
-                    'title': result.title,
-                    'authors': [author.name for author in result.authors],
-                    'abstract': result.summary,
-                    'pdf_url': result.pdf_url,
-                    'published': result.published,
-                    'updated': result.updated,
-                    'arxiv_id': result.entry_id.split('/')[-1],
-                    'categories': result.categories,
-                    'doi': result.doi,
-                    'comment': result.comment
-                }
-                articles.append(article)
-
-            logger.info(f"Successfully retrieved {len(articles)} articles")
-            return articles
+            # Callers mutate the yielded dicts and their author/category lists,
+            # so the cache keeps deep copies of its own
+            fetched = []
+            for result in self.client.results(search):
+                article = _to_dict(result)
+                fetched.append(copy.deepcopy(article))
+                yield article
+
+            self._search_cache.set(cache_key, fetched)
 
         except Exception as e:
             logger.error(f"Error searching arXiv: {str(e)}")
@@ -88,22 +196,14 @@ class ArxivScraper:
         Returns:
             Dict: Article metadata dictionary
         """
+        cached = self._article_cache.get(arxiv_id)
+        if cached is not None:
+            return copy.deepcopy(cached)
+
         try:
             search = arxiv.Search(id_list=[arxiv_id])
-            result = next(self.client.results(search))
-            
-            article = {
-                'title': result.title,
-                'authors': [author.name for author in result.authors],
-                'abstract': result.summary,
-                'pdf_url': result.pdf_url,
-                'published': result.published,
-                'updated': result.updated,
-                'arxiv_id': result.entry_id.split('/')[-1],
-                'categories': result.categories,
-                'doi': result.doi,
-                'comment': result.comment
-            }
+            article = _to_dict(next(self.client.results(search)))
+            self._article_cache.set(arxiv_id, copy.deepcopy(article))
             
             logger.info(f"Successfully retrieved article {arxiv_id}")
             return article
@@ -1,9 +1,14 @@
 from typing import Dict, List, Optional
 from datetime import datetime
 import re
+import sys
 
 from .base_processor import BaseProcessor
 
+# Python 3.11+ parses a trailing 'Z' natively, so the replace() copy is only
+# needed on older interpreters.
+_FROMISOFORMAT_ACCEPTS_Z = sys.version_info >= (3, 11)
+
 class MetadataProcessor(BaseProcessor):
     """Processor for handling article metadata processing."""
     
@@ -11,12 +16,20 @@ class MetadataProcessor(BaseProcessor):
         """Initialize the metadata processor."""
         super().__init__()
 
-    def process(self, metadata: Dict) -> Dict:
+    def process(
+        self,
+        metadata: Dict,
+        inplace: bool = True,
+        processed_at: Optional[str] = None,
+    ) -> Dict:
         """
         Process the article metadata.
         
         Args:
             metadata: Dictionary containing article metadata
+            inplace: Update and return metadata itself instead of a copy
+            processed_at: ISO timestamp to stamp on the article. Pass one
+                value for a whole batch to avoid formatting it per article.
             
         Returns:
             Processed metadata dictionary
@@ -24,7 +37,7 @@ class MetadataProcessor(BaseProcessor):
         if not self.validate_input(metadata):
             raise ValueError("Invalid metadata input")
 
-        processed = metadata.copy()
+        processed = metadata if inplace else dict(metadata)
         
         # Process authors
         if 'authors' in processed:
@@ -41,7 +54,7 @@ class MetadataProcessor(BaseProcessor):
             processed['categories'] = self._process_categories(processed['categories'])
         
         # Add processing timestamp
-        processed['processed_at'] = datetime.utcnow().isoformat()
+        processed['processed_at'] = processed_at or datetime.utcnow().isoformat()
         
         self.log_processing(metadata, processed)
         return processed
@@ -69,15 +82,15 @@ class MetadataProcessor(BaseProcessor):
             List of processed author dictionaries
         """
         processed_authors = []
+        append = processed_authors.append
         for author in authors:
-            parts = author.split()
-            processed_author = {
+            first, *rest = author.split() or ('',)
+            append({
                 'full_name': author,
-                'first_name': parts[0] if parts else '',
-                'last_name': parts[-1] if len(parts) > 1 else '',
-                'middle_names': ' '.join(parts[1:-1]) if len(parts) > 2 else ''
-            }
-            processed_authors.append(processed_author)
+                'first_name': first,
+                'last_name': rest[-1] if rest else '',
+                'middle_names': ' '.join(rest[:-1]),
+            })
         return processed_authors
 
     def _process_date(self, date_str: str) -> str:
@@ -91,9 +104,12 @@ class MetadataProcessor(BaseProcessor):
             ISO formatted date string
         """
         try:
+            if isinstance(date_str, datetime):
+                # arxiv hands back datetimes; format once so output never has to
+                return date_str.isoformat()
             if isinstance(date_str, str):
-                dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                return dt.isoformat()
+                iso = date_str if _FROMISOFORMAT_ACCEPTS_Z else date_str.replace('Z', '+00:00')
+                return datetime.fromisoformat(iso).isoformat()
             return date_str
         except ValueError:
             return date_str
@@ -1,37 +1,174 @@
+import functools
+import logging
 import re
-from typing import Dict, List, Optional
-import nltk
-from nltk.tokenize import word_tokenize, sent_tokenize
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
+import threading
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+try:
+    import blingfire
+except ImportError:  # Optional C++ tokenizer; NLTK's Punkt is used without it
+    blingfire = None
 
 from .base_processor import BaseProcessor
 
+logger = logging.getLogger(__name__)
+
+_CLEAN_RE = re.compile(r'[^\w\s.]+')
+_WS_RE = re.compile(r'\s+')
+
+# WordNetLemmatizer holds no per-call state, so one instance is shared by
+# every TextProcessor in the process. It is created on first use so
+# importing this module does not import NLTK.
+_LEMMATIZER = None
+_LEMMATIZER_LOCK = threading.Lock()
+
+
+# NLTK resources that could not be found or downloaded, recorded by the first
+# check so a missing corpus costs one download attempt per process, not one per text
+_NLTK_MISSING: Optional[Tuple[str, ...]] = None
+_NLTK_LOCK = threading.Lock()
+
+
+def _nltk_resources() -> Tuple[str, ...]:
+    """NLTK data the processor needs; Punkt ships as punkt_tab from NLTK 3.8.2 on."""
+    from nltk.tokenize import punkt
+    tokenizer = 'tokenizers/punkt_tab' if hasattr(punkt, 'PunktTokenizer') else 'tokenizers/punkt'
+    return (tokenizer, 'corpora/stopwords', 'corpora/wordnet')
+
+
+def _ensure_nltk() -> Tuple[str, ...]:
+    """
+    Download any missing NLTK resources, once per process.
+    
+    Returns:
+        The resources that are still missing, each warned about once
+    """
+    global _NLTK_MISSING
+    with _NLTK_LOCK:
+        if _NLTK_MISSING is not None:
+            return _NLTK_MISSING
+        
+        import nltk
+        
+        missing = []
+        for resource in _nltk_resources():
+            try:
+                nltk.data.find(resource)
+                continue
+            except LookupError:
+                pass
+            try:
+                downloaded = nltk.download(resource.split('/')[-1], quiet=True)
+            except Exception as e:
+                logger.debug(f"NLTK download of {resource} raised: {e}")
+                downloaded = False
+            if not downloaded:
+                missing.append(resource)
+                logger.warning(f"NLTK resource {resource!r} is missing and could not be downloaded")
+        _NLTK_MISSING = tuple(missing)
+        return _NLTK_MISSING
+
+
+def _shared_lemmatizer():
+    """The process-wide WordNetLemmatizer, created and warmed up on first use."""
+    global _LEMMATIZER
+    with _LEMMATIZER_LOCK:
+        if _LEMMATIZER is None:
+            from nltk.stem import WordNetLemmatizer
+            lemmatizer = WordNetLemmatizer()
+            # WordNet loads lazily on first use and that load is not thread-safe,
+            # so force it here, under the module lock, before it is published.
+            lemmatizer.lemmatize('warmup')
+            _LEMMATIZER = lemmatizer
+        return _LEMMATIZER
+
+
+@functools.lru_cache(maxsize=1)
+def _english_stop_words() -> FrozenSet[str]:
+    """English stop words, loaded once and shared by every processor."""
+    from nltk.corpus import stopwords
+    return frozenset(stopwords.words('english'))
+
+
+@functools.lru_cache(maxsize=200_000)
+def _normalize_token(word: str) -> str:
+    """
+    Filter and lemmatize a token with the default stop words and WordNet.
+    
+    Memoized across calls and every TextProcessor left on the defaults;
+    processors given custom stop words or a custom lemmatizer switch to a
+    memo of their own.
+    """
+    if not word.isalnum() or word in _english_stop_words():
+        return ''
+    return _LEMMATIZER.lemmatize(word)
+
+
 class TextProcessor(BaseProcessor):
     """Processor for handling article text processing."""
     
     def __init__(self):
-        """Initialize the text processor."""
+        """
+        Initialize the text processor.
+        
+        NLTK and its corpora are loaded on the first call to process(), so
+        constructing a processor that is never used stays cheap.
+        """
         super().__init__()
-        try:
-            nltk.data.find('tokenizers/punkt')
-            nltk.data.find('corpora/stopwords')
-            nltk.data.find('corpora/wordnet')
-        except LookupError:
-            nltk.download('punkt', quiet=True)
-            nltk.download('stopwords', quiet=True)
-            nltk.download('wordnet', quiet=True)
-        
-        try:
-            nltk.data.find('tokenizers/punkt_tab')
-        except LookupError:
-            try:
-                nltk.download('punkt_tab', quiet=True)
-            except Exception:
-                pass
+        # None until first use, when the shared NLTK defaults fill them in
+        self._stop_words: Optional[FrozenSet[str]] = None
+        self._lemmatizer = None
+        # The process-wide memo while both settings are the defaults
+        self._normalize_token = _normalize_token
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+    @property
+    def stop_words(self) -> FrozenSet[str]:
+        """Words dropped from processed_words; NLTK's English list by default."""
+        self._ensure_initialized()
+        return self._stop_words
+
+    @stop_words.setter
+    def stop_words(self, words: Iterable[str]) -> None:
+        self._stop_words = frozenset(words)
+        self._use_own_memo()
+
+    @property
+    def lemmatizer(self) -> Any:
+        """Lemmatizer applied to kept words; the shared WordNetLemmatizer by default."""
+        self._ensure_initialized()
+        return self._lemmatizer
+
+    @lemmatizer.setter
+    def lemmatizer(self, lemmatizer: Any) -> None:
+        self._lemmatizer = lemmatizer
+        self._use_own_memo()
+
+    def _use_own_memo(self) -> None:
+        """Switch to a fresh memo of _filter_and_lemmatize for this processor's custom settings."""
+        self._normalize_token = functools.lru_cache(maxsize=200_000)(self._filter_and_lemmatize)
+
+    def _ensure_initialized(self) -> None:
+        """Load the shared NLTK resources the first time this processor is used."""
+        if self._initialized:
+            return
         
-        self.stop_words = set(stopwords.words('english'))
-        self.lemmatizer = WordNetLemmatizer()
+        with self._init_lock:
+            if self._initialized:
+                return
+            
+            missing = _ensure_nltk()
+            if missing:
+                raise LookupError(
+                    f"NLTK resources unavailable: {', '.join(missing)}; "
+                    f"install them with nltk.download() and restart"
+                )
+            if self._stop_words is None:
+                self._stop_words = _english_stop_words()
+            if self._lemmatizer is None:
+                self._lemmatizer = _shared_lemmatizer()
+            self._initialized = True
 
     def process(self, text: str) -> Dict[str, any]:
         """
@@ -46,16 +183,12 @@ class TextProcessor(BaseProcessor):
         if not self.validate_input(text):
             raise ValueError("Invalid input text")
 
+        self._ensure_initialized()
         cleaned_text = self._clean_text(text)
         
-        sentences = sent_tokenize(cleaned_text)
-        words = word_tokenize(cleaned_text.lower())
+        sentences, words = self._tokenize(cleaned_text)
         
-        processed_words = [
-            self.lemmatizer.lemmatize(word)
-            for word in words
-            if word.isalnum() and word not in self.stop_words
-        ]
+        processed_words = [lemma for lemma in map(self._normalize_token, words) if lemma]
         
         key_phrases = self._extract_key_phrases(sentences)
         
@@ -71,6 +204,18 @@ class TextProcessor(BaseProcessor):
         self.log_processing(text, result)
         return result
 
+    def _filter_and_lemmatize(self, word: str) -> str:
+        """
+        Filter and lemmatize a single token.
+        
+        Returns the lemma of a content word, or '' for tokens that are dropped
+        (non-alphanumeric or stop words), so through the memo every repeat of
+        a token costs one cache hit regardless of which branch it takes.
+        """
+        if not word.isalnum() or word in self._stop_words:
+            return ''
+        return self._lemmatizer.lemmatize(word)
+
     def validate_input(self, text: str) -> bool:
         """
         Validate the input text.
@@ -93,9 +238,27 @@ class TextProcessor(BaseProcessor):
         Returns:
             Cleaned text
         """
-        text = re.sub(r'[^\w\s.]', ' ', text)
-        text = re.sub(r'\s+', ' ', text)
-        return text.strip()
+        return _WS_RE.sub(' ', _CLEAN_RE.sub(' ', text)).strip()
+
+    def _tokenize(self, text: str) -> Tuple[List[str], List[str]]:
+        """
+        Split cleaned text into sentences and lowercase words.
+        
+        Uses blingfire when installed and falls back to NLTK otherwise.
+        
+        Args:
+            text: Cleaned text to tokenize
+            
+        Returns:
+            Tuple of (sentences, words)
+        """
+        if blingfire is not None:
+            sentences = [s for s in blingfire.text_to_sentences(text).split('\n') if s]
+            words = blingfire.text_to_words(text.lower()).split()
+            return sentences, words
+        
+        from nltk.tokenize import sent_tokenize, word_tokenize
+        return sent_tokenize(text), word_tokenize(text.lower())
 
     def _extract_key_phrases(self, sentences: List[str], max_phrases: int = 5) -> List[str]:
         """
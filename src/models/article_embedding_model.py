@@ -1,25 +1,165 @@
-from typing import Dict, List, Union
+import importlib
+import importlib.metadata
+import re
+import threading
+from typing import Any, ClassVar, Dict, List, Tuple, Union
 import numpy as np
-from sentence_transformers import SentenceTransformer
-import torch
 import pickle
 
 from .base_model import BaseModel
+from src.utils.ttl_cache import TTLCache
+
+# torch and sentence_transformers take seconds to import, so they are
+# resolved on first use through the module __getattr__ below.
+_LAZY_IMPORTS = {
+    'torch': ('torch', None),
+    'SentenceTransformer': ('sentence_transformers', 'SentenceTransformer'),
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import heavy backends the first time they are accessed (PEP 562)."""
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _LAZY_IMPORTS[name]
+    value = importlib.import_module(module_name)
+    if attribute is not None:
+        value = getattr(value, attribute)
+    globals()[name] = value
+    return value
+
+
+_BACKENDS = ('torch', 'onnx', 'openvino')
+# First sentence-transformers release whose SentenceTransformer accepts backend=
+_MIN_EXPORTED_BACKEND_VERSION = (3, 2)
+
+
+def _check_backend(backend: str) -> None:
+    """Raise ValueError if the installed sentence-transformers cannot run this backend."""
+    if backend not in _BACKENDS:
+        raise ValueError(f"Unknown embedding backend {backend!r}; expected one of {', '.join(_BACKENDS)}")
+    if backend == 'torch':
+        return
+    installed = importlib.metadata.version('sentence-transformers')
+    release = tuple(int(part) for part in re.findall(r'\d+', installed)[:2])
+    if release < _MIN_EXPORTED_BACKEND_VERSION:
+        raise ValueError(
+            f"The {backend!r} embedding backend needs sentence-transformers>=3.2, "
+            f"but {installed} is installed; install it with pip install 'herald[{backend}]' "
+            f"or use the 'torch' backend"
+        )
+
+
+def _lazy(name: str) -> Any:
+    """Return a lazily imported backend, honouring anything already bound."""
+    return globals()[name] if name in globals() else __getattr__(name)
+
 
 class ArticleEmbeddingModel(BaseModel):
     """Model for generating article embeddings."""
     
-    def __init__(self, model_name: str = 'all-MiniLM-L6-v2'):
+    _shared: ClassVar[Dict[Tuple, 'ArticleEmbeddingModel']] = {}
+    _shared_lock: ClassVar[threading.Lock] = threading.Lock()
+    
+    # Minimum cosine between FP32 and int8 embeddings of the probe text for
+    # the quantized model to be kept.
+    _MIN_QUANTIZED_SIMILARITY = 0.98
+    _QUANTIZATION_PROBE = "Graph neural networks for molecular property prediction."
+    
+    def __init__(
+        self,
+        model_name: str = 'all-MiniLM-L6-v2',
+        batch_size: int = 64,
+        backend: str = 'torch',
+        quantize: bool = False,
+        cache_size: int = 4096,
+    ):
         """
         Initialize the article embedding model.
         
         Args:
             model_name: Name of the sentence transformer model to use
+            batch_size: Number of texts encoded per forward pass
+            backend: sentence-transformers inference backend. 'torch' (default),
+                or 'onnx' / 'openvino' with sentence-transformers>=3.2 and the
+                matching runtime installed.
+            quantize: Apply int8 dynamic quantization to Linear layers when
+                running the torch backend on CPU
+            cache_size: Number of text embeddings kept in memory. 0 disables caching.
         """
         super().__init__()
-        self.model = SentenceTransformer(model_name)
-        self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
-        self.model.to(self.device)
+        self.batch_size = batch_size
+        _check_backend(backend)
+        self.backend = backend
+        self.quantize = quantize
+        # Embedding rows keyed by their input text
+        self._cache = TTLCache(maxsize=cache_size)
+        self.device = 'cuda' if _lazy('torch').cuda.is_available() else 'cpu'
+        self.model = self._build(model_name)
+
+    @classmethod
+    def shared(cls, model_name: str = 'all-MiniLM-L6-v2', **kwargs: Any) -> 'ArticleEmbeddingModel':
+        """
+        Get the process-wide model for these settings, loading it on first use.
+        
+        Args:
+            model_name: Name of the sentence transformer model to use
+            **kwargs: Other constructor arguments
+            
+        Returns:
+            Shared ArticleEmbeddingModel instance
+        """
+        key = (model_name, tuple(sorted(kwargs.items())))
+        with cls._shared_lock:
+            model = cls._shared.get(key)
+            if model is None:
+                model = cls._shared[key] = cls(model_name, **kwargs)
+            return model
+
+    def _build(self, name_or_path: str) -> Any:
+        """Load a sentence transformer and place it on the target device."""
+        sentence_transformer = _lazy('SentenceTransformer')
+        if self.backend != 'torch':
+            # Exported runtimes pick their own execution provider
+            return sentence_transformer(name_or_path, backend=self.backend)
+        
+        model = sentence_transformer(name_or_path)
+        model.to(self.device)
+        if self.device == 'cuda':
+            model.half()
+        elif self.quantize:
+            self._quantize(model)
+        return model
+
+    def _quantize(self, model: Any) -> None:
+        """
+        Swap the transformer's Linear layers for int8 dynamically quantized ones.
+        
+        The probe text is embedded before and after quantization; if the two
+        embeddings drift apart the FP32 weights are restored.
+        """
+        torch = _lazy('torch')
+        transformer = model._first_module()
+        auto_model = getattr(transformer, 'auto_model', None)
+        if auto_model is None:
+            self.logger.warning("No transformer module found to quantize; keeping FP32 weights")
+            return
+        
+        probe = [self._QUANTIZATION_PROBE]
+        reference = model.encode(probe, normalize_embeddings=True, show_progress_bar=False)
+        transformer.auto_model = torch.ao.quantization.quantize_dynamic(
+            auto_model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        quantized = model.encode(probe, normalize_embeddings=True, show_progress_bar=False)
+        
+        similarity = float(np.dot(reference[0], quantized[0]))
+        if similarity < self._MIN_QUANTIZED_SIMILARITY:
+            transformer.auto_model = auto_model
+            self.logger.warning(
+                f"int8 embeddings diverged from FP32 (cosine {similarity:.4f}); keeping FP32 weights"
+            )
+        else:
+            self.logger.info(f"Using int8 quantized embedding model (probe cosine {similarity:.4f})")
 
     def train(self, data: List[Dict]) -> None:
         """
@@ -44,19 +184,59 @@ class ArticleEmbeddingModel(BaseModel):
         if isinstance(articles, dict):
             articles = [articles]
             
-        texts = []
-        for article in articles:
-            text = f"{article.get('title', '')} {article.get('abstract', '')}"
-            texts.append(text)
+        texts = [f"{article.get('title', '')} {article.get('abstract', '')}" for article in articles]
+        embeddings = self.predict_batch(texts)
+        
+        self.log_prediction(articles, embeddings)
+        return embeddings[0] if len(articles) == 1 else embeddings
+
+    def predict_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode a list of texts in a single batched call.
+        
+        Args:
+            texts: Texts to encode
             
+        Returns:
+            2D float32 array of L2-normalized embeddings, one row per text
+        """
+        if not texts:
+            return self._encode(texts)
+        
+        # Encode each distinct, uncached text once (multi-version preprints
+        # often repeat title and abstract) and assemble rows in input order.
+        rows: Dict[str, np.ndarray] = {}
+        missing: Dict[str, None] = {}
+        for text in texts:
+            if text in rows or text in missing:
+                continue
+            cached = self._cache.get(text)
+            if cached is None:
+                missing[text] = None
+            else:
+                rows[text] = cached
+        
+        if missing:
+            embeddings = self._encode(list(missing))
+            for text, embedding in zip(missing, embeddings):
+                embedding = embedding.copy()
+                embedding.setflags(write=False)
+                self._cache.set(text, embedding)
+                rows[text] = embedding
+        
+        return np.stack([rows[text] for text in texts])
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Run the sentence transformer over texts in batches."""
         embeddings = self.model.encode(
             texts,
+            batch_size=self.batch_size,
             convert_to_numpy=True,
-            show_progress_bar=True
+            normalize_embeddings=True,
+            show_progress_bar=False,
+            device=self.device,
         )
-        
-        self.log_prediction(articles, embeddings)
-        return embeddings[0] if len(articles) == 1 else embeddings
+        return embeddings.astype(np.float32, copy=False)
 
     def save(self, path: str) -> None:
         """
@@ -74,5 +254,5 @@ class ArticleEmbeddingModel(BaseModel):
         Args:
             path: Path to load the model from
         """
-        self.model = SentenceTransformer(path)
-        self.model.to(self.device) 
\ No newline at end of file
+        self.model = self._build(path)
+        self._cache.clear() 
\ No newline at end of file
@@ -2,8 +2,16 @@
 Main pipeline for Herald article search and ranking system.
 """
 import datetime
+import json
 import logging
-from typing import List, Dict, Optional, Tuple
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Dict, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # Optional C JSON encoder; stdlib json is used without it
+    orjson = None
 
 from src.data_collectors.arxiv_scrape import ArxivScraper
 from src.data_processors.metadata_processor import MetadataProcessor
@@ -25,6 +33,17 @@ def _format_authors(authors: List) -> str:
     return ', '.join(formatted)
 
 
+def _dumps_json(data: Any) -> bytes:
+    """Serialize CLI output as indented JSON, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(
+            data,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY,
+            default=str,
+        )
+    return json.dumps(data, indent=2, default=str).encode('utf-8')
+
+
 class HeraldPipeline:
     """
     Main pipeline that orchestrates article collection, processing, and ranking.
@@ -39,7 +58,11 @@ class HeraldPipeline:
         """
         self.config = config or ConfigLoader()
         
-        self.scraper = ArxivScraper()
+        self.scraper = ArxivScraper(
+            cache_ttl=self.config.get('data_collection.cache_ttl_seconds', 3600),
+            cache_size=self.config.get('data_collection.cache_max_entries', 128),
+            page_size=self.config.get('data_collection.page_size', 100),
+        )
         self.metadata_processor = MetadataProcessor()
         self.text_processor = TextProcessor()
         self.ranker = ArticleRanker(config=self.config)
@@ -55,6 +78,7 @@ class HeraldPipeline:
         process_text: Optional[bool] = None,
         date_from: Optional[str] = None,
         date_to: Optional[str] = None,
+        top_k: Optional[int] = None,
     ) -> List[Tuple[Dict, float]]:
         """
         Search for articles and rank them based on query and various criteria.
@@ -65,6 +89,7 @@ class HeraldPipeline:
             weights: Optional custom ranking weights
             process_metadata: Whether to process metadata (defaults to config)
             process_text: Whether to process text (defaults to config)
+            top_k: Return only the k best-ranked articles (default: all)
             
         Returns:
             List of (article, score) tuples, sorted by score (descending)
@@ -96,51 +121,72 @@ class HeraldPipeline:
             dt_to = dt_to.replace(day=last_day, hour=23, minute=59, second=59)
 
         logger.info(f"Fetching up to {max_results} articles from arXiv...")
-        articles = self.scraper.search_articles(
+        articles = self.scraper.iter_articles(
             query=query,
             max_results=max_results,
             date_from=dt_from,
             date_to=dt_to,
         )
         
-        if not articles:
+        # Articles are handed to the pool as they stream in, so processing of
+        # early pages overlaps with the arXiv delay before later pages.
+        processed_at = datetime.datetime.utcnow().isoformat()
+        max_workers = max(1, min(self.config.get('processing.max_workers', 8), max_results))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    self._process_article, article, i, process_metadata, process_text, processed_at
+                )
+                for i, article in enumerate(articles)
+            ]
+            processed_articles = [future.result() for future in futures]
+        
+        if not processed_articles:
             logger.warning("No articles found")
             return []
         
-        logger.info(f"Fetched {len(articles)} articles")
-        
-        processed_articles = []
-        for i, article in enumerate(articles):
-            try:
-                if process_metadata:
-                    article = self.metadata_processor.process(article)
-                
-                if process_text and 'abstract' in article:
-                    text_result = self.text_processor.process(article['abstract'])
-                    article['processed_text'] = text_result
-                
-                processed_articles.append(article)
-                
-                if (i + 1) % 10 == 0:
-                    logger.debug(f"Processed {i + 1}/{len(articles)} articles")
-                    
-            except Exception as e:
-                logger.error(f"Error processing article {i}: {str(e)}")
-                processed_articles.append(article)
-        
         logger.info(f"Processed {len(processed_articles)} articles")
         
         logger.info("Ranking articles...")
         ranked_articles = self.ranker.rank_articles(
             articles=processed_articles,
             query=query,
-            weights=weights
+            weights=weights,
+            top_k=top_k,
         )
         
-        logger.info(f"Ranked {len(ranked_articles)} articles")
+        logger.info(f"Ranked {len(processed_articles)} articles")
         
         return ranked_articles
     
+    def _process_article(
+        self,
+        article: Dict,
+        index: int,
+        process_metadata: bool,
+        process_text: bool,
+        processed_at: Optional[str] = None,
+    ) -> Dict:
+        """
+        Run metadata and text processing for a single article.
+        
+        Errors are logged and the article is returned as far as it got, so one
+        bad article never aborts the batch.
+        """
+        try:
+            if process_metadata:
+                article = self.metadata_processor.process(article, processed_at=processed_at)
+            
+            if process_text and 'abstract' in article:
+                text_result = self.text_processor.process(article['abstract'])
+                article['processed_text'] = text_result
+            
+            logger.debug(f"Processed article {index}")
+        except Exception as e:
+            logger.error(f"Error processing article {index}: {str(e)}")
+        
+        return article
+    
     def get_article_by_id(self, arxiv_id: str) -> Dict:
         """
         Get a single article by arXiv ID.
@@ -167,7 +213,8 @@ class HeraldPipeline:
         self,
         articles: List[Dict],
         query: Optional[str] = None,
-        weights: Optional[Dict[str, float]] = None
+        weights: Optional[Dict[str, float]] = None,
+        top_k: Optional[int] = None,
     ) -> List[Tuple[Dict, float]]:
         """
         Rank a list of existing articles without fetching new ones.
@@ -176,6 +223,7 @@ class HeraldPipeline:
             articles: List of article dictionaries
             query: Optional search query for relevance scoring
             weights: Optional custom ranking weights
+            top_k: Return only the k best-ranked articles (default: all)
             
         Returns:
             List of (article, score) tuples, sorted by score (descending)
@@ -184,7 +232,8 @@ class HeraldPipeline:
         return self.ranker.rank_articles(
             articles=articles,
             query=query,
-            weights=weights
+            weights=weights,
+            top_k=top_k,
         )
 
 
@@ -252,28 +301,27 @@ def main():
         results = pipeline.search_and_rank(
             query=args.query,
             max_results=args.max_results,
-            weights=weights
+            weights=weights,
+            top_k=args.top,
         )
         
-        top_results = results[:args.top]
-        
         if args.output == 'json':
-            import json
             output = [
                 {
                     'article': article,
                     'score': float(score)
                 }
-                for article, score in top_results
+                for article, score in results
             ]
-            print(json.dumps(output, indent=2, default=str))
+            sys.stdout.flush()
+            sys.stdout.buffer.write(_dumps_json(output) + b'\n')
         
         elif args.output == 'table':
             print(f"\n{'='*80}")
-            print(f"Top {len(top_results)} Results for: '{args.query}'")
+            print(f"Top {len(results)} Results for: '{args.query}'")
             print(f"{'='*80}\n")
             
-            for i, (article, score) in enumerate(top_results, 1):
+            for i, (article, score) in enumerate(results, 1):
                 print(f"{i}. {article.get('title', 'Unknown Title')}")
                 print(f"   Score: {score:.4f}")
                 print(f"   Authors: {_format_authors(article.get('authors', []))}")
@@ -284,7 +332,7 @@ def main():
                 print()
         
         else:
-            for i, (article, score) in enumerate(top_results, 1):
+            for i, (article, score) in enumerate(results, 1):
                 print(f"{i}. [{score:.4f}] {article.get('title', 'Unknown Title')}")
         
     except Exception as e:
@@ -1,15 +1,25 @@
+import logging
 import math
 import re
-from datetime import datetime, timezone
+import time
+from datetime import datetime
+from functools import lru_cache
 from typing import Dict, Iterable, List, Optional, Tuple
 
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
 
 from src.models.article_embedding_model import ArticleEmbeddingModel
 from src.utils.citation_fetcher import CitationFetcher
 from src.utils.config_loader import ConfigLoader
 
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=4096)
+def _iso_timestamp(value: str) -> float:
+    """POSIX timestamp of an ISO-8601 string; the same papers recur across rankings."""
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
 
 class ArticleRanker:
     """Engine for ranking articles based on query fit and browse quality."""
@@ -19,6 +29,7 @@ class ArticleRanker:
         "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in",
         "into", "is", "it", "of", "on", "or", "that", "the", "to", "with",
     }
+    _RELEVANCE_COMPONENTS = ("semantic_similarity", "lexical_overlap", "title_overlap", "phrase_match")
 
     def __init__(
         self,
@@ -27,92 +38,202 @@ class ArticleRanker:
         citation_fetcher: Optional[CitationFetcher] = None,
     ):
         self.config = config or ConfigLoader()
-        self.embedding_model = embedding_model or ArticleEmbeddingModel(
-            model_name=self.config.get_embedding_model_name()
-        )
+        # The default model is only loaded when something is first embedded
+        self._embedding_model = embedding_model
+        self._embedding_model_failed = False
+        self._embedding_model_settings = {
+            "model_name": self.config.get_embedding_model_name(),
+            "batch_size": self.config.get_embedding_batch_size(),
+            "backend": self.config.get('models.embedding_backend', 'torch'),
+            "quantize": self.config.get('models.quantize_on_cpu', False),
+            "cache_size": self.config.get('models.embedding_cache_size', 4096),
+        }
         self.citation_fetcher = citation_fetcher
         if self.citation_fetcher is None and self.config.is_citation_enabled():
             self.citation_fetcher = CitationFetcher(
-                rate_limit_delay=self.config.get_citation_rate_limit()
+                rate_limit_delay=self.config.get_citation_rate_limit(),
+                max_workers=self.config.get('citation.max_workers', 10),
+                cache_path=self.config.get('citation.cache_path'),
+                cache_ttl=self.config.get('citation.cache_ttl_seconds', 7 * 24 * 3600),
+            )
+        self._load_settings()
+
+    def _load_settings(self) -> None:
+        """Resolve the settings read on the per-article path, once per config version."""
+        self._config_version = self.config.version
+        self._citation_enabled = self.config.is_citation_enabled()
+        self._max_citations = max(self.config.get_max_citations_for_normalization(), 1)
+        self._recency_decay_days = max(float(self.config.get("ranking.recency_decay_days", 365)), 1.0)
+        self._abstract_saturation = max(float(self.config.get("ranking.abstract_length_saturation", 180)), 1.0)
+        relevance_component_weights = self._normalize_weights(
+            self.config.get(
+                "ranking.relevance_components",
+                {
+                    "semantic_similarity": 0.55,
+                    "lexical_overlap": 0.2,
+                    "title_overlap": 0.2,
+                    "phrase_match": 0.05,
+                },
             )
+        )
+        self._relevance_component_weights = np.array(
+            [relevance_component_weights.get(name, 0.0) for name in self._RELEVANCE_COMPONENTS]
+        )
+
+    @property
+    def embedding_model(self) -> Optional[ArticleEmbeddingModel]:
+        """Embedding model, resolved to the shared instance on first access.
+
+        None if the default model failed to load; the failure is logged once and
+        ranking falls back to lexical scoring instead of retrying the load.
+        """
+        if self._embedding_model is None and not self._embedding_model_failed:
+            try:
+                self._embedding_model = ArticleEmbeddingModel.shared(**self._embedding_model_settings)
+            except Exception as e:
+                self._embedding_model_failed = True
+                logger.warning(
+                    f"Could not load embedding model {self._embedding_model_settings['model_name']!r}, "
+                    f"using lexical relevance only: {e}"
+                )
+        return self._embedding_model
+
+    @embedding_model.setter
+    def embedding_model(self, model: Optional[ArticleEmbeddingModel]) -> None:
+        self._embedding_model = model
+        self._embedding_model_failed = False
 
     def rank_articles(
         self,
         articles: List[Dict],
         query: Optional[str] = None,
         weights: Optional[Dict[str, float]] = None,
+        top_k: Optional[int] = None,
     ) -> List[Tuple[Dict, float]]:
         """
         Rank articles and annotate them with feature-level ranking metadata.
 
+        Args:
+            top_k: Return only the k best articles. Every article is still
+                scored and annotated.
+
         Returns:
             List of (article, score) tuples sorted by score descending.
         """
         if not articles:
             return []
+        if self._config_version != self.config.version:
+            self._load_settings()
 
         query = (query or "").strip()
         query_context = self._build_query_context(query) if query else None
         normalized_weights = self._normalize_weights(weights or self.config.get_ranking_weights())
 
-        article_embeddings: Optional[List[Optional[np.ndarray]]] = None
+        semantic_similarities = np.zeros(len(articles))
         if query_context is not None and query_context["embedding"] is not None:
             article_embeddings = self._predict_embeddings(articles)
+            if article_embeddings is not None:
+                semantic_similarities = self._calculate_semantic_similarities(
+                    query_context["embedding"], article_embeddings
+                )
+
+        recency_scores = self._calculate_recency_scores(articles)
+        citation_scores = self._calculate_citation_scores(articles)
 
-        scored_articles: List[Tuple[Dict, float]] = []
+        feature_rows: List[Dict[str, float]] = []
         for index, article in enumerate(articles):
-            article_embedding = article_embeddings[index] if article_embeddings is not None else None
-            feature_scores = self._collect_feature_scores(article, query_context, article_embedding)
-            score = self._combine_feature_scores(feature_scores, normalized_weights)
+            feature_scores = self._collect_feature_scores(
+                article,
+                query_context,
+                semantic_similarity=float(semantic_similarities[index]),
+                recency=float(recency_scores[index]),
+                citations=float(citation_scores[index]),
+            )
             article["ranking_features"] = feature_scores
             article["ranking_explanation"] = self._build_explanation(feature_scores, query_context is not None)
+            feature_rows.append(feature_scores)
+
+        feature_names = list(feature_rows[0])
+        features = np.array([[row[name] for name in feature_names] for row in feature_rows])
+        if query_context is not None:
+            relevance = self._combine_relevance_components(
+                features[:, [feature_names.index(name) for name in self._RELEVANCE_COMPONENTS]]
+            )
+            features[:, feature_names.index("relevance")] = relevance
+            for row, value in zip(feature_rows, relevance.tolist()):
+                row["relevance"] = value
+        scores = self._combine_feature_scores(features, feature_names, normalized_weights)
+
+        for article, score in zip(articles, scores.tolist()):
             article["ranking_score"] = score
-            scored_articles.append((article, score))
-
-        return sorted(
-            scored_articles,
-            key=lambda item: (
-                item[1],
-                item[0].get("ranking_features", {}).get("relevance", 0.0),
-                item[0].get("ranking_features", {}).get("title_overlap", 0.0),
-                item[0].get("ranking_features", {}).get("recency", 0.0),
-            ),
-            reverse=True,
-        )
+
+        candidates = np.arange(len(articles))
+        if top_k is not None and top_k < len(articles) // 2:
+            if top_k <= 0:
+                return []
+            # Partition out the k-th best score and fully order only the articles
+            # at or above it (ties included, so tie-breaking stays exact).
+            kth_score = np.partition(scores, len(scores) - top_k)[len(scores) - top_k]
+            candidates = np.flatnonzero(scores >= kth_score)
+
+        # Descending by score, then relevance, title overlap and recency; lexsort
+        # keys run from least to most significant and keep input order on ties.
+        tie_breakers = [features[candidates, feature_names.index(name)] for name in ("recency", "title_overlap", "relevance")]
+        order = candidates[np.lexsort([-column for column in tie_breakers] + [-scores[candidates]])]
+        if top_k is not None:
+            order = order[:max(top_k, 0)]
+        return [(articles[index], articles[index]["ranking_score"]) for index in order]
 
     def _build_query_context(self, query: str) -> Dict[str, object]:
+        normalized, tokens = self._analyze_text(query)
         return {
             "raw": query,
-            "normalized": self._normalize_text(query),
-            "tokens": self._tokenize(query),
+            "normalized": normalized,
+            "tokens": tokens,
             "embedding": self._predict_query_embedding(query),
         }
 
     def _predict_query_embedding(self, query: str) -> Optional[np.ndarray]:
+        # Repeated queries are served from the embedding model's text cache
         try:
-            return self.embedding_model.predict({"title": query, "abstract": ""})
+            embedding_model = self.embedding_model
+            if embedding_model is None:
+                return None
+            embedding = embedding_model.predict({"title": query, "abstract": ""})
         except Exception:
             return None
 
-    def _predict_embeddings(self, articles: List[Dict]) -> List[Optional[np.ndarray]]:
+        return self._l2_normalize(np.asarray(embedding).reshape(1, -1))[0]
+
+    def _predict_embeddings(self, articles: List[Dict]) -> Optional[np.ndarray]:
+        """Unit-length article embeddings as one (n_articles, dim) matrix, or None on failure."""
         try:
-            embeddings = self.embedding_model.predict(articles)
-            return [embedding for embedding in embeddings]
+            embedding_model = self.embedding_model
+            if embedding_model is None:
+                return None
+            return self._l2_normalize(np.vstack(embedding_model.predict(articles)))
         except Exception:
-            return [None] * len(articles)
+            return None
+
+    @staticmethod
+    def _l2_normalize(embeddings: np.ndarray) -> np.ndarray:
+        # Contiguous float32 keeps the similarity product on BLAS sgemv
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        norms = np.sqrt(np.einsum("ij,ij->i", embeddings, embeddings))
+        return embeddings / np.maximum(norms, 1e-12)[:, None]
 
     def _collect_feature_scores(
         self,
         article: Dict,
         query_context: Optional[Dict[str, object]],
-        article_embedding: Optional[np.ndarray] = None,
+        semantic_similarity: float = 0.0,
+        recency: float = 0.0,
+        citations: float = 0.0,
     ) -> Dict[str, float]:
         title = article.get("title", "") or ""
         abstract = article.get("abstract", "") or article.get("summary", "") or ""
-        title_norm = self._normalize_text(title)
-        abstract_norm = self._normalize_text(abstract)
-        title_tokens = self._tokenize(title)
-        abstract_tokens = self._tokenize(abstract)
+        title_norm, title_tokens = self._analyze_text(title)
+        abstract_norm, abstract_tokens = self._analyze_text(abstract)
         all_tokens = title_tokens + abstract_tokens
 
         scores: Dict[str, float] = {
@@ -122,8 +243,8 @@ class ArticleRanker:
             "title_overlap": 0.0,
             "phrase_match": 0.0,
             "quality": self._calculate_quality_score(abstract),
-            "recency": self._calculate_recency_score(article),
-            "citations": self._calculate_citation_score(article),
+            "recency": recency,
+            "citations": citations,
         }
 
         if query_context is None:
@@ -131,119 +252,100 @@ class ArticleRanker:
 
         query_tokens = query_context["tokens"]
         query_norm = query_context["normalized"]
-        query_embedding = query_context["embedding"]
 
         lexical_overlap = self._token_overlap_score(query_tokens, all_tokens)
         title_overlap = self._token_overlap_score(query_tokens, title_tokens)
         phrase_match = self._phrase_match_score(query_norm, title_norm, abstract_norm)
-        semantic_similarity = self._calculate_semantic_similarity(query_embedding, article_embedding)
 
         scores["lexical_overlap"] = lexical_overlap
         scores["title_overlap"] = title_overlap
         scores["phrase_match"] = phrase_match
         scores["semantic_similarity"] = semantic_similarity
-        scores["relevance"] = self._combine_relevance_components(
-            semantic_similarity=semantic_similarity,
-            lexical_overlap=lexical_overlap,
-            title_overlap=title_overlap,
-            phrase_match=phrase_match,
-        )
+        # "relevance" is filled in for all articles at once by _combine_relevance_components
         return scores
 
-    def _combine_feature_scores(self, feature_scores: Dict[str, float], weights: Dict[str, float]) -> float:
-        active_weights: Dict[str, float] = {}
-        for feature, weight in weights.items():
-            score = feature_scores.get(feature)
-            if score is None:
-                continue
-            if feature == "relevance" and score <= 0.0:
-                continue
-            active_weights[feature] = weight
-
-        if not active_weights:
-            return 0.0
-
-        normalized = self._normalize_weights(active_weights)
-        total_score = sum(feature_scores[feature] * weight for feature, weight in normalized.items())
-        return float(min(1.0, max(0.0, total_score)))
-
-    def _combine_relevance_components(
+    def _combine_feature_scores(
         self,
-        semantic_similarity: float,
-        lexical_overlap: float,
-        title_overlap: float,
-        phrase_match: float,
-    ) -> float:
-        component_weights = self.config.get(
-            "ranking.relevance_components",
-            {
-                "semantic_similarity": 0.55,
-                "lexical_overlap": 0.2,
-                "title_overlap": 0.2,
-                "phrase_match": 0.05,
-            },
-        )
-
-        components = {
-            "semantic_similarity": semantic_similarity,
-            "lexical_overlap": lexical_overlap,
-            "title_overlap": title_overlap,
-            "phrase_match": phrase_match,
-        }
-        normalized = self._normalize_weights(component_weights)
-        return float(sum(components[name] * normalized.get(name, 0.0) for name in components))
+        features: np.ndarray,
+        feature_names: List[str],
+        weights: Dict[str, float],
+    ) -> np.ndarray:
+        """
+        Weighted score per row of an (n_articles, n_features) matrix.
 
-    def _calculate_semantic_similarity(
+        Relevance is left out of an article's weighting when it is not positive
+        (no query, or nothing matched), and the remaining weights are
+        renormalized per article.
+        """
+        weighted = [name for name in weights if name in feature_names]
+        if not weighted:
+            return np.zeros(len(features))
+
+        columns = features[:, [feature_names.index(name) for name in weighted]]
+        weight_vector = np.array([max(float(weights[name]), 0.0) for name in weighted])
+        active = np.ones_like(columns)
+        if "relevance" in weighted:
+            relevance = weighted.index("relevance")
+            active[:, relevance] = columns[:, relevance] > 0.0
+
+        active_totals = active @ weight_vector
+        totals = (columns * active) @ weight_vector
+        scores = np.divide(totals, active_totals, out=np.zeros_like(totals), where=active_totals > 0.0)
+        return np.clip(scores, 0.0, 1.0)
+
+    def _combine_relevance_components(self, components: np.ndarray) -> np.ndarray:
+        """Relevance per row of an (n_articles, 4) matrix ordered as _RELEVANCE_COMPONENTS."""
+        return components @ self._relevance_component_weights
+
+    def _calculate_semantic_similarities(
         self,
-        query_embedding: Optional[np.ndarray],
-        article_embedding: Optional[np.ndarray],
-    ) -> float:
-        if query_embedding is None or article_embedding is None:
-            return 0.0
-
-        similarity = cosine_similarity(
-            query_embedding.reshape(1, -1),
-            article_embedding.reshape(1, -1),
-        )[0][0]
-        return float(min(1.0, max(0.0, (similarity + 1.0) / 2.0)))
-
-    def _calculate_recency_score(self, article: Dict) -> float:
-        published = article.get("published")
-        if published is None:
-            return 0.0
+        query_embedding: np.ndarray,
+        article_embeddings: np.ndarray,
+    ) -> np.ndarray:
+        """Cosine similarity of every article to the query, mapped to [0, 1].
 
+        Both inputs are already unit length, so cosine reduces to a dot product.
+        """
+        similarities = article_embeddings @ query_embedding
+        return np.clip((similarities + 1.0) / 2.0, 0.0, 1.0)
+
+    def _calculate_recency_score(self, article: Dict, now: Optional[float] = None) -> float:
+        return float(self._calculate_recency_scores([article], now=now)[0])
+
+    def _calculate_recency_scores(self, articles: List[Dict], now: Optional[float] = None) -> np.ndarray:
+        """Exponential age decay as of now (POSIX time, default current); 0 where the date is missing or invalid."""
+        timestamps = np.array([self._published_timestamp(article.get("published")) for article in articles])
+        reference = time.time() if now is None else now
+        days_old = np.maximum((reference - timestamps) / 86400, 0.0)
+        scores = np.exp(-days_old / self._recency_decay_days)
+        return np.nan_to_num(np.clip(scores, 0.0, 1.0), nan=0.0)
+
+    def _published_timestamp(self, published: object) -> float:
+        """POSIX timestamp of a publication date (naive dates are local time), NaN if unusable."""
         try:
             if isinstance(published, datetime):
-                pub_date = published
-            elif isinstance(published, str):
-                pub_date = datetime.fromisoformat(published.replace("Z", "+00:00"))
-            else:
-                return 0.0
-
-            now = datetime.now(timezone.utc) if pub_date.tzinfo is not None else datetime.now()
-            days_old = max(0.0, (now - pub_date).total_seconds() / 86400)
-            decay_days = max(float(self.config.get("ranking.recency_decay_days", 365)), 1.0)
-            score = np.exp(-days_old / decay_days)
-            return float(min(1.0, max(0.0, score)))
-        except (ValueError, TypeError):
-            return 0.0
+                return published.timestamp()
+            if isinstance(published, str):
+                return _iso_timestamp(published)
+        except (ValueError, TypeError, OverflowError, OSError):
+            pass
+        return math.nan
 
     def _calculate_citation_score(self, article: Dict) -> float:
-        if not self.config.is_citation_enabled() or self.citation_fetcher is None:
-            return 0.0
+        return float(self._calculate_citation_scores([article])[0])
 
-        citation_count = article.get("citation_count")
-        if citation_count is None:
-            citation_count = self.citation_fetcher.get_citation_count(article)
-            if citation_count is not None:
-                article["citation_count"] = citation_count
+    def _calculate_citation_scores(self, articles: List[Dict]) -> np.ndarray:
+        """Log-scaled citation counts normalized to [0, 1]; 0 where no count is known."""
+        if not self._citation_enabled or self.citation_fetcher is None:
+            return np.zeros(len(articles))
 
-        if citation_count is None or citation_count <= 0:
-            return 0.0
+        counts = np.array(
+            [count or 0 for count in self.citation_fetcher.fetch_all(articles)],
+            dtype=float,
+        )
 
-        max_citations = max(self.config.get_max_citations_for_normalization(), 1)
-        normalized = math.log1p(citation_count) / math.log1p(max_citations)
-        return float(min(1.0, max(0.0, normalized)))
+        normalized = np.log1p(np.maximum(counts, 0.0)) / math.log1p(self._max_citations)
+        return np.clip(normalized, 0.0, 1.0)
 
     def _calculate_quality_score(self, abstract: str) -> float:
         abstract = (abstract or "").strip()
@@ -251,8 +353,7 @@ class ArticleRanker:
             return 0.0
 
         word_count = len(abstract.split())
-        saturation = max(float(self.config.get("ranking.abstract_length_saturation", 180)), 1.0)
-        score = min(word_count / saturation, 1.0)
+        score = min(word_count / self._abstract_saturation, 1.0)
         return float(score)
 
     def _phrase_match_score(self, query_norm: str, title_norm: str, abstract_norm: str) -> float:
@@ -302,10 +403,11 @@ class ArticleRanker:
             explanations.append("Abstract has enough detail for robust matching.")
         return explanations[:4]
 
-    def _normalize_text(self, text: str) -> str:
-        return " ".join(self._TOKEN_RE.findall((text or "").lower()))
-
-    def _tokenize(self, text: str) -> List[str]:
+    def _analyze_text(self, text: str) -> Tuple[str, List[str]]:
+        """Normalized text and content tokens from a single regex scan."""
         tokens = self._TOKEN_RE.findall((text or "").lower())
+        return " ".join(tokens), self._filter_tokens(tokens)
+
+    def _filter_tokens(self, tokens: List[str]) -> List[str]:
         filtered = [token for token in tokens if token not in self._STOPWORDS]
         return filtered or tokens
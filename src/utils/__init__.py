@@ -3,6 +3,6 @@ Utility modules for Herald.
 """
 from .citation_fetcher import CitationFetcher
 from .config_loader import ConfigLoader
+from .ttl_cache import TTLCache
 
-__all__ = ['CitationFetcher', 'ConfigLoader']
-
+__all__ = ['CitationFetcher', 'ConfigLoader', 'TTLCache']
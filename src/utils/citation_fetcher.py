@@ -2,9 +2,15 @@
 Utility for fetching citation data from external APIs.
 """
 import logging
-from typing import Dict, Optional
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 import requests
 import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
@@ -13,24 +19,221 @@ class CitationFetcher:
     """Fetches citation counts from Semantic Scholar API."""
     
     BASE_URL = "https://api.semanticscholar.org/graph/v1/paper"
+    # Most IDs the /paper/batch endpoint accepts per request
+    BATCH_SIZE = 500
     
-    def __init__(self, rate_limit_delay: float = 0.1):
+    def __init__(
+        self,
+        rate_limit_delay: float = 0.1,
+        max_workers: int = 10,
+        cache_path: Optional[str] = None,
+        cache_ttl: float = 7 * 24 * 3600,
+    ):
         """
         Initialize the citation fetcher.
         
         Args:
             rate_limit_delay: Delay between API calls in seconds (default 0.1)
+            max_workers: Maximum concurrent lookups in fetch_all (default 10)
+            cache_path: SQLite file persisting found counts across runs, keyed
+                by DOI / arXiv ID. None disables the cache.
+            cache_ttl: Seconds a cached count stays valid (default 7 days)
         """
         self.rate_limit_delay = rate_limit_delay
-        self.last_request_time = 0
+        self.max_workers = max_workers
+        self.cache_ttl = cache_ttl
+        self._next_request_time = 0.0
+        self._rate_lock = threading.Lock()
+        self._session = self._build_session(max_workers)
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        if cache_path:
+            self._open_cache(os.path.expanduser(cache_path))
+    
+    @staticmethod
+    def _build_session(max_workers: int) -> requests.Session:
+        """Session with pooled keep-alive connections and retries on transient errors."""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=max(20, max_workers),
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+                # The batch endpoint is a read-only POST, so it is safe to retry
+                allowed_methods=frozenset(["GET", "POST"]),
+                raise_on_status=False,
+            ),
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+    
+    def _open_cache(self, path: str) -> None:
+        """Open (creating if needed) the on-disk citation cache."""
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Shared by fetch_all worker threads; access is serialized by _db_lock
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS citations "
+                "(id TEXT PRIMARY KEY, count INTEGER NOT NULL, fetched_at REAL NOT NULL)"
+            )
+            self._db.commit()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Citation cache unavailable at {path}: {str(e)}")
+            self._db = None
+    
+    @staticmethod
+    def _cache_keys(article: Dict) -> List[str]:
+        """Canonical cache keys for the article's DOI and arXiv ID."""
+        keys = []
+        if article.get('doi'):
+            keys.append(f"doi:{article['doi'].lower()}")
+        if article.get('arxiv_id'):
+            keys.append(f"arxiv:{article['arxiv_id']}")
+        return keys
+    
+    def _cached_count(self, article: Dict) -> Optional[int]:
+        """Look up a fresh cached count for the article, if any."""
+        keys = self._cache_keys(article)
+        if self._db is None or not keys:
+            return None
+        
+        placeholders = ",".join("?" * len(keys))
+        with self._db_lock:
+            row = self._db.execute(
+                f"SELECT count FROM citations WHERE id IN ({placeholders}) AND fetched_at >= ? "
+                "ORDER BY fetched_at DESC LIMIT 1",
+                (*keys, time.time() - self.cache_ttl),
+            ).fetchone()
+        return row[0] if row else None
+    
+    def _store_counts(self, found: List[Tuple[Dict, int]]) -> None:
+        """Persist found counts under every ID of their articles."""
+        if self._db is None:
+            return
+        
+        now = time.time()
+        rows = [(key, count, now) for article, count in found for key in self._cache_keys(article)]
+        if not rows:
+            return
+        with self._db_lock:
+            self._db.executemany("INSERT OR REPLACE INTO citations (id, count, fetched_at) VALUES (?, ?, ?)", rows)
+            self._db.commit()
     
     def _rate_limit(self):
-        """Enforce rate limiting between API calls."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < self.rate_limit_delay:
-            time.sleep(self.rate_limit_delay - time_since_last)
-        self.last_request_time = time.time()
+        """Enforce rate limiting between API calls, across threads."""
+        # Reserve the next free slot under the lock and sleep outside it, so
+        # concurrent callers start requests at most once per delay.
+        with self._rate_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_request_time)
+            self._next_request_time = slot + self.rate_limit_delay
+        if slot > now:
+            time.sleep(slot - now)
+    
+    def fetch_all(self, articles: List[Dict]) -> List[Optional[int]]:
+        """
+        Get citation counts for many articles.
+        
+        DOIs and arXiv IDs are resolved through the batch endpoint first; the
+        remaining articles fall back to per-article lookups run concurrently.
+        Counts found upstream are stored on the article as 'citation_count'.
+        
+        Args:
+            articles: Article dictionaries with metadata
+            
+        Returns:
+            Citation count per article, None where it could not be found
+        """
+        counts, answered = self._fetch_counts_batched(articles)
+        missing = [index for index, count in enumerate(counts) if count is None]
+        if not missing:
+            return counts
+        
+        def lookup(index: int) -> Optional[int]:
+            article = articles[index]
+            if not answered[index]:
+                return self.get_citation_count(article)
+            # The batch already checked this article's IDs; only title search is left
+            if not article.get('title'):
+                return None
+            count = self._fetch_by_title(article['title'])
+            if count is not None:
+                self._store_counts([(article, count)])
+            return count
+        
+        workers = max(1, min(self.max_workers, len(missing)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for index, count in zip(missing, executor.map(lookup, missing)):
+                counts[index] = count
+                if count is not None:
+                    articles[index]['citation_count'] = count
+        return counts
+    
+    def get_citation_counts_batch(self, articles: List[Dict]) -> List[Optional[int]]:
+        """
+        Get citation counts for many articles by DOI / arXiv ID in batched requests.
+        
+        Counts found upstream are stored on the article as 'citation_count'.
+        
+        Args:
+            articles: Article dictionaries with metadata
+            
+        Returns:
+            Citation count per article, None where no ID matched
+        """
+        counts, _ = self._fetch_counts_batched(articles)
+        return counts
+    
+    def _fetch_counts_batched(self, articles: List[Dict]) -> Tuple[List[Optional[int]], List[bool]]:
+        """Batched DOI then arXiv ID lookups, plus whether every lookup for an article got an answer."""
+        counts: List[Optional[int]] = [article.get('citation_count') for article in articles]
+        answered = [True] * len(articles)
+        for index, article in enumerate(articles):
+            if counts[index] is None:
+                counts[index] = self._cached_count(article)
+                if counts[index] is not None:
+                    article['citation_count'] = counts[index]
+        
+        # Same precedence as get_citation_count: DOI first, then arXiv ID
+        for prefix, field in (('DOI', 'doi'), ('ARXIV', 'arxiv_id')):
+            pending = [index for index, count in enumerate(counts) if count is None and articles[index].get(field)]
+            for start in range(0, len(pending), self.BATCH_SIZE):
+                chunk = pending[start:start + self.BATCH_SIZE]
+                results = self._fetch_batch([f"{prefix}:{articles[index][field]}" for index in chunk])
+                if results is None:
+                    for index in chunk:
+                        answered[index] = False
+                    continue
+                found = []
+                for index, count in zip(chunk, results):
+                    if count is not None:
+                        counts[index] = count
+                        articles[index]['citation_count'] = count
+                        found.append((articles[index], count))
+                self._store_counts(found)
+        return counts, answered
+    
+    def _fetch_batch(self, paper_ids: List[str]) -> Optional[List[Optional[int]]]:
+        """Fetch citation counts for up to BATCH_SIZE prefixed paper IDs; None if the request failed."""
+        try:
+            self._rate_limit()
+            url = f"{self.BASE_URL}/batch"
+            params = {"fields": "citationCount"}
+            response = self._session.post(url, params=params, json={"ids": paper_ids}, timeout=30)
+            
+            if response.status_code == 200:
+                return [paper.get('citationCount', 0) if paper else None for paper in response.json()]
+            logger.warning(f"Semantic Scholar batch API returned status {response.status_code} for {len(paper_ids)} IDs")
+            return None
+        except Exception as e:
+            logger.error(f"Error fetching citations for {len(paper_ids)} IDs: {str(e)}")
+            return None
     
     def get_citation_count(self, article: Dict) -> Optional[int]:
         """
@@ -46,6 +249,15 @@ class CitationFetcher:
         if 'citation_count' in article and article['citation_count'] is not None:
             return article['citation_count']
         
+        citation_count = self._cached_count(article)
+        if citation_count is None:
+            citation_count = self._lookup_citation_count(article)
+            if citation_count is not None:
+                self._store_counts([(article, citation_count)])
+        return citation_count
+    
+    def _lookup_citation_count(self, article: Dict) -> Optional[int]:
+        """Query the API by DOI, then arXiv ID, then title."""
         # Try multiple methods to find the paper
         paper_id = None
         
@@ -78,7 +290,7 @@ class CitationFetcher:
             self._rate_limit()
             url = f"{self.BASE_URL}/DOI:{doi}"
             params = {"fields": "citationCount"}
-            response = requests.get(url, params=params, timeout=5)
+            response = self._session.get(url, params=params, timeout=5)
             
             if response.status_code == 200:
                 data = response.json()
@@ -98,7 +310,7 @@ class CitationFetcher:
             self._rate_limit()
             url = f"{self.BASE_URL}/arXiv:{arxiv_id}"
             params = {"fields": "citationCount"}
-            response = requests.get(url, params=params, timeout=5)
+            response = self._session.get(url, params=params, timeout=5)
             
             if response.status_code == 200:
                 data = response.json()
@@ -122,7 +334,7 @@ class CitationFetcher:
                 "limit": 1,
                 "fields": "citationCount,title"
             }
-            response = requests.get(url, params=params, timeout=5)
+            response = self._session.get(url, params=params, timeout=5)
             
             if response.status_code == 200:
                 data = response.json()
@@ -1,15 +1,81 @@
 """
 Configuration loader for Herald application.
 """
+import copy
 import os
 import yaml
 import logging
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Optional
 from pathlib import Path
 
+try:
+    # libyaml-backed parser, available when PyYAML was built against libyaml
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
 logger = logging.getLogger(__name__)
 
 
+class _TrackedDict(dict):
+    """dict that reports in-place changes, wrapping nested dicts as they are stored."""
+    
+    def __init__(self, data: Dict[str, Any], on_change: Callable[[], None]):
+        self._on_change = on_change
+        super().__init__((key, self._wrap(value)) for key, value in data.items())
+    
+    def _wrap(self, value: Any) -> Any:
+        if isinstance(value, dict) and not isinstance(value, _TrackedDict):
+            return _TrackedDict(value, self._on_change)
+        return value
+    
+    def __setitem__(self, key: str, value: Any) -> None:
+        super().__setitem__(key, self._wrap(value))
+        self._on_change()
+    
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self._on_change()
+    
+    def __ior__(self, other: Dict[str, Any]) -> '_TrackedDict':
+        self.update(other)
+        return self
+    
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            super().__setitem__(key, self._wrap(value))
+        self._on_change()
+    
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return self[key]
+    
+    def pop(self, key: str, *default: Any) -> Any:
+        value = super().pop(key, *default)
+        self._on_change()
+        return value
+    
+    def popitem(self) -> Any:
+        item = super().popitem()
+        self._on_change()
+        return item
+    
+    def clear(self) -> None:
+        super().clear()
+        self._on_change()
+    
+    # Copies are plain dicts, detached from the loader
+    def __copy__(self) -> Dict[str, Any]:
+        return dict(self)
+    
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Dict[str, Any]:
+        return copy.deepcopy(dict(self), memo)
+    
+    def __reduce__(self) -> Any:
+        return (dict, (dict(self),))
+
+
 class ConfigLoader:
     """Loads and manages application configuration."""
     
@@ -26,51 +92,90 @@ class ConfigLoader:
             config_path = project_root / "config" / "config.yaml"
         
         self.config_path = Path(config_path)
-        self.config: Dict[str, Any] = {}
+        # Every dotted key path (including intermediate sections) -> value;
+        # None after a change, rebuilt by the next get()
+        self._flat: Optional[Dict[str, Any]] = None
+        # Bumped on every change to the config, so holders of derived settings can refresh
+        self.version = 0
+        self._config: Dict[str, Any] = _TrackedDict({}, self._invalidate)
         self.load()
     
+    @property
+    def config(self) -> Dict[str, Any]:
+        """The nested configuration; edits in place are seen by get()."""
+        return self._config
+    
+    @config.setter
+    def config(self, value: Dict[str, Any]) -> None:
+        self._config = _TrackedDict(value, self._invalidate)
+        self._invalidate()
+    
+    def _invalidate(self) -> None:
+        """Drop the lookup index after any change to the config."""
+        self._flat = None
+        self.version += 1
+    
     def _deep_merge(self, base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Deep merge two dictionaries.
+        Deep merge override into base, in place.
         
         Args:
-            base: Base dictionary (defaults)
+            base: Base dictionary (defaults), updated in place
             override: Override dictionary (user config)
             
         Returns:
-            Merged dictionary
+            The merged base dictionary
         """
-        result = base.copy()
+        stack = [(base, override)]
+        while stack:
+            target, source = stack.pop()
+            for key, value in source.items():
+                current = target.get(key)
+                if isinstance(current, dict) and isinstance(value, dict):
+                    # Merge nested dictionaries level by level
+                    stack.append((current, value))
+                else:
+                    # Override with new value
+                    target[key] = value
         
-        for key, value in override.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                # Recursively merge nested dictionaries
-                result[key] = self._deep_merge(result[key], value)
-            else:
-                # Override with new value
-                result[key] = value
-        
-        return result
+        return base
     
     def load(self) -> None:
         """Load configuration from YAML file."""
+        self.config = self._read_config()
+    
+    def _read_config(self) -> Dict[str, Any]:
+        """Read the YAML file merged over defaults, or defaults if it is missing or invalid."""
         if not self.config_path.exists():
             logger.warning(f"Config file not found at {self.config_path}, using defaults")
-            self.config = self._get_default_config()
-            return
+            return self._get_default_config()
         
         try:
             with open(self.config_path, 'r') as f:
-                user_config = yaml.safe_load(f) or {}
+                user_config = yaml.load(f, Loader=_SafeLoader) or {}
             
             # Deep merge with defaults to ensure all keys exist
             defaults = self._get_default_config()
-            self.config = self._deep_merge(defaults, user_config)
+            config = self._deep_merge(defaults, user_config)
             
             logger.info(f"Loaded configuration from {self.config_path}")
+            return config
         except Exception as e:
             logger.error(f"Error loading config: {str(e)}, using defaults")
-            self.config = self._get_default_config()
+            return self._get_default_config()
+    
+    def _build_index(self) -> None:
+        """Flatten the config into dotted keys so get() is a single dict lookup."""
+        flat: Dict[str, Any] = {}
+        stack = [('', self.config)]
+        while stack:
+            prefix, section = stack.pop()
+            for key, value in section.items():
+                dotted = f"{prefix}{key}"
+                flat[dotted] = value
+                if isinstance(value, dict):
+                    stack.append((f"{dotted}.", value))
+        self._flat = flat
     
     def _get_default_config(self) -> Dict[str, Any]:
         """Get default configuration."""
@@ -92,17 +197,27 @@ class ConfigLoader:
                 'abstract_length_saturation': 180,
             },
             'models': {
-                'embedding_model': 'all-MiniLM-L6-v2'
+                'embedding_model': 'all-MiniLM-L6-v2',
+                'embedding_batch_size': 64,
+                'embedding_backend': 'torch',
+                'quantize_on_cpu': False,
+                'embedding_cache_size': 4096,
             },
             'citation': {
                 'enabled': True,
                 'rate_limit_delay': 0.1,
+                'max_workers': 10,
+                'cache_path': None,
+                'cache_ttl_seconds': 604800,
                 'normalization_max_citations': 1000
             },
             'data_collection': {
                 'max_results': 100,
                 'default_sort': 'submitted_date',
-                'default_sort_order': 'descending'
+                'default_sort_order': 'descending',
+                'cache_ttl_seconds': 3600,
+                'cache_max_entries': 128,
+                'page_size': 100,
             },
             'news': {
                 'default_sources': [
@@ -130,7 +245,8 @@ class ConfigLoader:
             },
             'processing': {
                 'process_metadata': True,
-                'process_text': True
+                'process_text': True,
+                'max_workers': 8,
             }
         }
     
@@ -145,16 +261,30 @@ class ConfigLoader:
         Returns:
             Configuration value
         """
-        keys = key.split('.')
-        value = self.config
+        if self._flat is None:
+            self._build_index()
+        return self._flat.get(key, default)
+    
+    def set(self, key: str, value: Any) -> None:
+        """
+        Set a configuration value by key (supports dot notation).
         
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return default
+        Equivalent to assigning into the nested ``config`` dict, but creates
+        missing sections. ArticleRanker re-reads its scoring settings on the next rank_articles()
+        call; its embedding model and citation fetcher keep the settings they
+        were built with.
         
-        return value
+        Args:
+            key: Configuration key (e.g., 'citation.enabled')
+            value: New value; missing parent sections are created
+        """
+        *parents, leaf = key.split('.')
+        section = self.config
+        for k in parents:
+            if not isinstance(section.get(k), dict):
+                section[k] = {}
+            section = section[k]
+        section[leaf] = value
     
     def get_ranking_weights(self) -> Dict[str, float]:
         """Get ranking weights configuration."""
@@ -169,6 +299,10 @@ class ConfigLoader:
         """Get embedding model name."""
         return self.get('models.embedding_model', 'all-MiniLM-L6-v2')
     
+    def get_embedding_batch_size(self) -> int:
+        """Get number of texts encoded per embedding forward pass."""
+        return self.get('models.embedding_batch_size', 64)
+    
     def is_citation_enabled(self) -> bool:
         """Check if citation fetching is enabled."""
         return self.get('citation.enabled', True)
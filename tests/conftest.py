@@ -0,0 +1,26 @@
+"""
+Shared pytest fixtures.
+"""
+import os
+from pathlib import Path
+
+import pytest
+
+from tests.fixtures.http_cache import HTTPCache
+
+
+# Outside the repo so recordings are never committed; HERALD_HTTP_CACHE_DIR overrides it
+_DEFAULT_HTTP_CACHE_DIR = Path.home() / ".cache" / "herald" / "http_cache"
+
+
+@pytest.fixture(scope="session")
+def http_cache():
+    """Record real HTTP responses on first use and replay them on later runs.
+    
+    Used by the network-marked integration tests, which only run on request
+    (pytest -m network).
+    """
+    directory = os.environ.get("HERALD_HTTP_CACHE_DIR", _DEFAULT_HTTP_CACHE_DIR)
+    cache = HTTPCache(directory).install()
+    yield cache
+    cache.uninstall()
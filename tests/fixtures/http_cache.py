@@ -0,0 +1,93 @@
+"""
+On-disk HTTP response cache for tests that talk to real APIs.
+
+The first run records each successful response as JSON keyed by request;
+later runs replay it without touching the network.
+"""
+import base64
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+from unittest import mock
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Describe the raw body, which is stored already decoded
+_DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding'}
+
+
+class HTTPCache:
+    """Record-and-replay cache installed over requests.Session.request."""
+    
+    def __init__(self, directory: Union[str, Path]):
+        """
+        Initialize the cache.
+        
+        Args:
+            directory: Where recorded responses are stored, one JSON file per request
+        """
+        self.directory = Path(directory)
+        self._memory: Dict[str, Dict[str, Any]] = {}
+        self._patcher = None
+    
+    @staticmethod
+    def key(method: str, url: str, params: Any = None, data: Any = None, json_body: Any = None) -> str:
+        """Stable digest identifying a request."""
+        payload = json.dumps([method.upper(), url, params, data, json_body], sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+    
+    def load(self, key: str) -> Optional[requests.Response]:
+        """Rebuild a recorded response, or None on a miss."""
+        record = self._memory.get(key)
+        if record is None:
+            path = self.directory / f"{key}.json"
+            if not path.exists():
+                return None
+            record = self._memory[key] = json.loads(path.read_text(encoding='utf-8'))
+        
+        response = requests.Response()
+        response.status_code = record['status_code']
+        response.headers = CaseInsensitiveDict(record['headers'])
+        response.url = record['url']
+        response.encoding = record['encoding']
+        response._content = base64.b64decode(record['content'])
+        return response
+    
+    def save(self, key: str, response: requests.Response) -> None:
+        """Record a response in memory and on disk."""
+        record = {
+            'status_code': response.status_code,
+            'headers': {k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS},
+            'url': response.url,
+            'encoding': response.encoding,
+            'content': base64.b64encode(response.content).decode('ascii'),
+        }
+        self._memory[key] = record
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / f"{key}.json").write_text(json.dumps(record), encoding='utf-8')
+    
+    def install(self) -> 'HTTPCache':
+        """Route every requests.Session request through the cache."""
+        real_request = requests.Session.request
+        cache = self
+        
+        def request(session, method, url, params=None, data=None, json=None, **kwargs):
+            key = cache.key(method, url, params, data, json)
+            response = cache.load(key)
+            if response is None:
+                response = real_request(session, method, url, params=params, data=data, json=json, **kwargs)
+                if response.status_code == 200:
+                    cache.save(key, response)
+            return response
+        
+        self._patcher = mock.patch.object(requests.Session, 'request', request)
+        self._patcher.start()
+        return self
+    
+    def uninstall(self) -> None:
+        """Restore the real requests.Session.request."""
+        if self._patcher is not None:
+            self._patcher.stop()
+            self._patcher = None
@@ -0,0 +1,58 @@
+"""
+Shared fixtures for unit tests.
+"""
+import contextlib
+from unittest.mock import Mock
+
+import pytest
+
+import src.pipeline as pipeline_module
+from src.pipeline import HeraldPipeline
+
+# Component class name -> the instance attributes HeraldPipeline actually calls.
+# spec_set keeps the instance mocks from auto-creating (and tracking) anything else.
+_PIPELINE_COMPONENTS = {
+    'ArxivScraper': ['iter_articles', 'get_article_by_id'],
+    'MetadataProcessor': ['process'],
+    'TextProcessor': ['process'],
+    'ArticleRanker': ['rank_articles'],
+}
+
+
+@contextlib.contextmanager
+def _swap_attrs(module, **replacements):
+    """Set module attributes for the duration of the block, restoring the originals after."""
+    originals = {name: getattr(module, name) for name in replacements}
+    for name, value in replacements.items():
+        setattr(module, name, value)
+    try:
+        yield replacements
+    finally:
+        for name, value in originals.items():
+            setattr(module, name, value)
+
+
+@pytest.fixture(scope="class")
+def patched_pipeline():
+    """HeraldPipeline built once per test class, with its component classes mocked.
+    
+    Yields (pipeline, mocks), where mocks maps each component class name to the
+    plain Mock swapped in for it on src.pipeline.
+    """
+    # Plain Mocks swapped straight onto the module: nothing here uses magic
+    # methods, and mock.patch machinery is not needed for a class swap.
+    mocks = {
+        name: Mock(return_value=Mock(spec_set=attributes))
+        for name, attributes in _PIPELINE_COMPONENTS.items()
+    }
+    with _swap_attrs(pipeline_module, **mocks):
+        yield HeraldPipeline(), mocks
+
+
+@pytest.fixture
+def pipeline(patched_pipeline):
+    """The class-shared pipeline with its component mocks reset for this test."""
+    pipeline, _ = patched_pipeline
+    for component in (pipeline.scraper, pipeline.metadata_processor, pipeline.text_processor, pipeline.ranker):
+        component.reset_mock(return_value=True, side_effect=True)
+    return pipeline
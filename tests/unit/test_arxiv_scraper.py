@@ -0,0 +1,142 @@
+"""
+Tests for arXiv scraper.
+"""
+import datetime
+import unittest
+from types import SimpleNamespace
+
+import arxiv
+
+from src.data_collectors.arxiv_scrape import ArxivScraper, _PooledArxivClient
+
+
+def _fake_result(index):
+    return SimpleNamespace(
+        title=f"Paper {index}",
+        authors=[SimpleNamespace(name=f"Author {index}")],
+        summary=f"Abstract {index}",
+        pdf_url=f"https://arxiv.org/pdf/2401.0000{index}",
+        published=datetime.datetime(2024, 1, index + 1, tzinfo=datetime.timezone.utc),
+        updated=datetime.datetime(2024, 1, index + 1, tzinfo=datetime.timezone.utc),
+        entry_id=f"http://arxiv.org/abs/2401.0000{index}v1",
+        categories=["cs.LG"],
+        doi=None,
+        comment=None,
+    )
+
+
+class _FakeClient:
+    def __init__(self, count=2):
+        self.count = count
+        self.calls = 0
+
+    def results(self, search):
+        self.calls += 1
+        return iter([_fake_result(i) for i in range(self.count)])
+
+
+class TestArxivScraper(unittest.TestCase):
+    def setUp(self):
+        self.client = _FakeClient()
+        self.scraper = ArxivScraper(client=self.client)
+
+    def test_search_articles_converts_results(self):
+        """Test results are converted to article dictionaries"""
+        articles = self.scraper.search_articles("graphs", max_results=2)
+
+        self.assertEqual(len(articles), 2)
+        self.assertEqual(articles[0]['title'], 'Paper 0')
+        self.assertEqual(articles[0]['authors'], ['Author 0'])
+        self.assertEqual(articles[0]['arxiv_id'], '2401.00000v1')
+
+    def test_repeated_search_is_served_from_cache(self):
+        """Test identical searches only hit arXiv once"""
+        first = self.scraper.search_articles("graphs", max_results=2)
+        first[0]['title'] = 'mutated by caller'
+        second = self.scraper.search_articles("graphs", max_results=2)
+
+        self.assertEqual(self.client.calls, 1)
+        self.assertEqual(second[0]['title'], 'Paper 0')
+
+    def test_cached_lists_are_not_shared_with_callers(self):
+        """Test in-place edits to author and category lists never reach the cache"""
+        for article in self.scraper.search_articles("graphs", max_results=2):
+            article['authors'].append('Added by caller')
+        self.scraper.get_article_by_id('2401.00000')['categories'].clear()
+
+        searched = self.scraper.search_articles("graphs", max_results=2)
+        looked_up = self.scraper.get_article_by_id('2401.00000')
+
+        self.assertEqual(searched[0]['authors'], ['Author 0'])
+        self.assertEqual(looked_up['categories'], ['cs.LG'])
+
+    def test_different_search_arguments_miss_cache(self):
+        """Test the cache key includes the search arguments"""
+        self.scraper.search_articles("graphs", max_results=2)
+        self.scraper.search_articles("graphs", max_results=5)
+
+        self.assertEqual(self.client.calls, 2)
+
+    def test_get_article_by_id_is_cached(self):
+        """Test repeated ID lookups only hit arXiv once"""
+        first = self.scraper.get_article_by_id('2401.00000')
+        second = self.scraper.get_article_by_id('2401.00000')
+
+        self.assertEqual(self.client.calls, 1)
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+
+    def test_iter_articles_caches_only_after_full_consumption(self):
+        """Test a partially consumed stream is not cached"""
+        stream = self.scraper.iter_articles("graphs", max_results=2)
+        self.assertEqual(next(stream)['title'], 'Paper 0')
+        stream.close()
+
+        articles = list(self.scraper.iter_articles("graphs", max_results=2))
+        list(self.scraper.iter_articles("graphs", max_results=2))
+
+        self.assertEqual([a['title'] for a in articles], ['Paper 0', 'Paper 1'])
+        self.assertEqual(self.client.calls, 2)
+
+    def test_cache_can_be_disabled(self):
+        """Test a zero-sized cache always queries arXiv"""
+        scraper = ArxivScraper(client=self.client, cache_size=0)
+        scraper.search_articles("graphs", max_results=2)
+        scraper.search_articles("graphs", max_results=2)
+
+        self.assertEqual(self.client.calls, 2)
+
+
+class TestPooledArxivClient(unittest.TestCase):
+    def test_page_size_is_trimmed_to_remaining_results(self):
+        """Test pages never request more entries than the search needs"""
+        client = _PooledArxivClient(page_size=100)
+        search = arxiv.Search(query="graphs", max_results=130)
+
+        self.assertIn("max_results=100", client._format_url(search, 0, client.page_size))
+        self.assertIn("max_results=30", client._format_url(search, 100, client.page_size))
+
+    def test_small_search_requests_exact_count(self):
+        """Test a search smaller than a page asks for exactly max_results"""
+        client = _PooledArxivClient(page_size=100)
+        search = arxiv.Search(query="graphs", max_results=10)
+
+        self.assertIn("max_results=10&", client._format_url(search, 0, client.page_size) + "&")
+
+    def test_session_pools_without_adding_retries(self):
+        """Test the pooled adapter leaves retrying to arxiv.Client"""
+        client = _PooledArxivClient(page_size=100, num_retries=3)
+        adapter = client._session.get_adapter("https://export.arxiv.org/api/query")
+
+        self.assertEqual(adapter.max_retries.total, 0)
+        self.assertEqual(client.num_retries, 3)
+
+    def test_scraper_caps_page_size_at_api_limit(self):
+        """Test configured page sizes are capped at arXiv's limit"""
+        scraper = ArxivScraper(page_size=5000)
+
+        self.assertEqual(scraper.client.page_size, 2000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,16 @@
 """
 Tests for citation fetcher.
 """
+import os
+import tempfile
+import threading
+import time
 import unittest
 from unittest.mock import patch, Mock
+
+import pytest
+import requests
+
 from src.utils.citation_fetcher import CitationFetcher
 
 
@@ -15,7 +23,7 @@ class TestCitationFetcher(unittest.TestCase):
             'doi': '10.48550/arXiv.1706.03762'
         }
     
-    @patch('src.utils.citation_fetcher.requests.get')
+    @patch.object(requests.Session, 'get')
     def test_fetch_by_arxiv_id_success(self, mock_get):
         """Test successful citation fetch by arXiv ID"""
         mock_response = Mock()
@@ -28,7 +36,7 @@ class TestCitationFetcher(unittest.TestCase):
         self.assertEqual(result, 50000)
         mock_get.assert_called_once()
     
-    @patch('src.utils.citation_fetcher.requests.get')
+    @patch.object(requests.Session, 'get')
     def test_fetch_by_arxiv_id_not_found(self, mock_get):
         """Test citation fetch when paper not found"""
         mock_response = Mock()
@@ -39,7 +47,7 @@ class TestCitationFetcher(unittest.TestCase):
         
         self.assertIsNone(result)
     
-    @patch('src.utils.citation_fetcher.requests.get')
+    @patch.object(requests.Session, 'get')
     def test_fetch_by_doi_success(self, mock_get):
         """Test successful citation fetch by DOI"""
         mock_response = Mock()
@@ -51,7 +59,7 @@ class TestCitationFetcher(unittest.TestCase):
         
         self.assertEqual(result, 1000)
     
-    @patch('src.utils.citation_fetcher.requests.get')
+    @patch.object(requests.Session, 'get')
     def test_get_citation_count_with_arxiv_id(self, mock_get):
         """Test getting citation count using arXiv ID"""
         mock_response = Mock()
@@ -64,7 +72,7 @@ class TestCitationFetcher(unittest.TestCase):
         
         self.assertEqual(result, 50000)
     
-    @patch('src.utils.citation_fetcher.requests.get')
+    @patch.object(requests.Session, 'get')
     def test_get_citation_count_with_doi(self, mock_get):
         """Test getting citation count using DOI"""
         mock_response = Mock()
@@ -77,7 +85,7 @@ class TestCitationFetcher(unittest.TestCase):
         
         self.assertEqual(result, 1000)
     
-    @patch('src.utils.citation_fetcher.requests.get')
+    @patch.object(requests.Session, 'get')
     def test_get_citation_count_not_found(self, mock_get):
         """Test when citation count cannot be found"""
         mock_response = Mock()
@@ -96,6 +104,150 @@ class TestCitationFetcher(unittest.TestCase):
         
         # Should return cached value without API call
         self.assertEqual(result, 100)
+    
+    def test_session_pools_connections_and_retries(self):
+        """Test requests share one session with retrying pooled connections"""
+        adapter = self.fetcher._session.get_adapter(CitationFetcher.BASE_URL)
+        
+        self.assertEqual(adapter.max_retries.total, 3)
+        self.assertIn(429, adapter.max_retries.status_forcelist)
+        self.assertGreaterEqual(adapter._pool_maxsize, self.fetcher.max_workers)
+    
+    def test_fetch_all_only_looks_up_missing_counts(self):
+        """Test fetch_all skips cached counts and stores fetched ones"""
+        articles = [{'citation_count': 7}, {'title': 'One'}, {'title': 'Two'}]
+        
+        with patch.object(self.fetcher, '_fetch_by_title', side_effect=lambda title: len(title) * 10) as mock_fetch:
+            counts = self.fetcher.fetch_all(articles)
+        
+        self.assertEqual(counts, [7, 30, 30])
+        self.assertEqual(mock_fetch.call_count, 2)
+        self.assertEqual(articles[2]['citation_count'], 30)
+    
+    @patch.object(requests.Session, 'post')
+    def test_batch_lookup_prefers_doi_then_arxiv(self, mock_post):
+        """Test DOIs and arXiv IDs are resolved in batched POSTs"""
+        doi_response = Mock(status_code=200)
+        doi_response.json.return_value = [{'citationCount': 12}, None]
+        arxiv_response = Mock(status_code=200)
+        arxiv_response.json.return_value = [{'citationCount': 34}, {'citationCount': 56}]
+        mock_post.side_effect = [doi_response, arxiv_response]
+        articles = [
+            {'doi': '10.1/a', 'arxiv_id': '1.1'},
+            {'doi': '10.1/b', 'arxiv_id': '2.2'},
+            {'arxiv_id': '3.3'},
+        ]
+        
+        counts = self.fetcher.get_citation_counts_batch(articles)
+        
+        self.assertEqual(counts, [12, 34, 56])
+        self.assertEqual(mock_post.call_args_list[0].kwargs['json'], {'ids': ['DOI:10.1/a', 'DOI:10.1/b']})
+        self.assertEqual(mock_post.call_args_list[1].kwargs['json'], {'ids': ['ARXIV:2.2', 'ARXIV:3.3']})
+        self.assertEqual(articles[1]['citation_count'], 34)
+    
+    @patch.object(requests.Session, 'post')
+    def test_batch_lookup_splits_large_requests(self, mock_post):
+        """Test batched lookups send at most BATCH_SIZE IDs per request"""
+        def respond(url, params=None, json=None, timeout=None):
+            response = Mock(status_code=200)
+            response.json.return_value = [{'citationCount': 1}] * len(json['ids'])
+            return response
+        mock_post.side_effect = respond
+        self.fetcher.rate_limit_delay = 0.0
+        
+        counts = self.fetcher.get_citation_counts_batch([{'arxiv_id': str(i)} for i in range(1200)])
+        
+        self.assertEqual(counts, [1] * 1200)
+        self.assertEqual([len(call.kwargs['json']['ids']) for call in mock_post.call_args_list], [500, 500, 200])
+    
+    @patch.object(requests.Session, 'post')
+    def test_fetch_all_falls_back_when_batch_fails(self, mock_post):
+        """Test per-article lookups are used when the batch request fails"""
+        mock_post.return_value = Mock(status_code=503)
+        
+        with patch.object(self.fetcher, '_fetch_by_arxiv_id', return_value=9) as mock_fetch:
+            counts = self.fetcher.fetch_all([{'arxiv_id': '1706.03762'}])
+        
+        self.assertEqual(counts, [9])
+        mock_fetch.assert_called_once_with('1706.03762')
+    
+    @pytest.mark.serial
+    def test_fetch_all_runs_lookups_concurrently(self):
+        """Test slow lookups overlap instead of running back to back"""
+        fetcher = CitationFetcher(rate_limit_delay=0.0, max_workers=4)
+        in_flight = []
+        peak = []
+        lock = threading.Lock()
+        
+        def slow_lookup(title):
+            with lock:
+                in_flight.append(title)
+                peak.append(len(in_flight))
+            time.sleep(0.05)
+            with lock:
+                in_flight.remove(title)
+            return 1
+        
+        with patch.object(fetcher, '_fetch_by_title', side_effect=slow_lookup):
+            counts = fetcher.fetch_all([{'title': str(i)} for i in range(4)])
+        
+        self.assertEqual(counts, [1, 1, 1, 1])
+        self.assertGreater(max(peak), 1)
+    
+    @pytest.mark.serial
+    def test_rate_limit_spaces_concurrent_requests(self):
+        """Test the rate limiter hands out one start slot per delay across threads"""
+        fetcher = CitationFetcher(rate_limit_delay=0.02)
+        threads = [threading.Thread(target=fetcher._rate_limit) for _ in range(4)]
+        
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        # Four callers get slots at 0, 20, 40 and 60 ms
+        self.assertGreaterEqual(time.monotonic() - start, 0.055)
+
+
+class TestCitationCache(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.cache_path = os.path.join(temp_dir.name, 'nested', 'citations.sqlite')
+    
+    def test_found_counts_persist_across_instances(self):
+        """Test a count fetched once is served from disk by a new fetcher"""
+        fetcher = CitationFetcher(rate_limit_delay=0.0, cache_path=self.cache_path)
+        with patch.object(fetcher, '_fetch_by_arxiv_id', return_value=42):
+            self.assertEqual(fetcher.get_citation_count({'arxiv_id': '1706.03762'}), 42)
+        
+        reopened = CitationFetcher(rate_limit_delay=0.0, cache_path=self.cache_path)
+        with patch.object(requests.Session, 'post') as mock_post, \
+                patch.object(requests.Session, 'get') as mock_get:
+            counts = reopened.fetch_all([{'arxiv_id': '1706.03762', 'doi': '10.1/x'}])
+        
+        self.assertEqual(counts, [42])
+        mock_post.assert_not_called()
+        mock_get.assert_not_called()
+    
+    def test_batch_results_are_cached(self):
+        """Test counts from the batch endpoint are written to the cache"""
+        fetcher = CitationFetcher(rate_limit_delay=0.0, cache_path=self.cache_path)
+        response = Mock(status_code=200)
+        response.json.return_value = [{'citationCount': 5}]
+        with patch.object(requests.Session, 'post', return_value=response):
+            fetcher.get_citation_counts_batch([{'doi': '10.1/ABC'}])
+        
+        self.assertEqual(fetcher._cached_count({'doi': '10.1/abc'}), 5)
+    
+    def test_expired_entries_are_ignored(self):
+        """Test counts older than the TTL are fetched again"""
+        fetcher = CitationFetcher(rate_limit_delay=0.0, cache_path=self.cache_path, cache_ttl=0.0)
+        fetcher._store_counts([({'arxiv_id': '1'}, 3)])
+        time.sleep(0.01)
+        
+        self.assertIsNone(fetcher._cached_count({'arxiv_id': '1'}))
 
 
 if __name__ == '__main__':
@@ -1,6 +1,7 @@
 """
 Tests for configuration loader.
 """
+import copy
 import unittest
 import tempfile
 import os
@@ -111,6 +112,65 @@ class TestConfigLoader(unittest.TestCase):
             self.assertIsNotNone(config.get('ranking.weights.recency'))
         finally:
             os.unlink(temp_path)
+    
+    def test_get_returns_sections_and_leaves(self):
+        """Test dotted lookups resolve both nested sections and leaf values"""
+        config = ConfigLoader(config_path='/nonexistent/path/config.yaml')
+        
+        self.assertEqual(config.get('ranking.weights'), config.config['ranking']['weights'])
+        self.assertEqual(config.get('ranking.weights.relevance'), 0.65)
+        self.assertIsNone(config.get('ranking.weights.relevance.extra'))
+    
+    def test_set_updates_lookups(self):
+        """Test that set() changes are visible through get()"""
+        config = ConfigLoader(config_path='/nonexistent/path/config.yaml')
+        
+        config.set('ranking.weights', {'relevance': 1.0})
+        config.set('new.section.value', 3)
+        
+        self.assertEqual(config.get('ranking.weights.relevance'), 1.0)
+        self.assertIsNone(config.get('ranking.weights.recency'))
+        self.assertEqual(config.get('new.section'), {'value': 3})
+        self.assertEqual(config.config['new']['section']['value'], 3)
+    
+    def test_in_place_edits_update_lookups(self):
+        """Test that writes into config and returned sections are visible through get()"""
+        config = ConfigLoader(config_path='/nonexistent/path/config.yaml')
+        
+        config.config['citation']['enabled'] = False
+        config.get('ranking.weights')['relevance'] = 0.5
+        config.config['ranking']['weights'].update({'recency': 0.4})
+        del config.config['processing']
+        
+        self.assertFalse(config.get('citation.enabled'))
+        self.assertEqual(config.get('ranking.weights.relevance'), 0.5)
+        self.assertEqual(config.get('ranking.weights.recency'), 0.4)
+        self.assertIsNone(config.get('processing.max_workers'))
+        
+        config.config = {'citation': {'enabled': True}}
+        self.assertTrue(config.get('citation.enabled'))
+        self.assertIsNone(config.get('ranking.weights'))
+    
+    def test_copies_of_config_are_plain_dicts(self):
+        """Test that copied sections no longer report changes to the loader"""
+        config = ConfigLoader(config_path='/nonexistent/path/config.yaml')
+        
+        weights = copy.deepcopy(config.get('ranking.weights'))
+        version = config.version
+        weights['relevance'] = 0.0
+        
+        self.assertIs(type(weights), dict)
+        self.assertEqual(config.version, version)
+        self.assertEqual(config.get('ranking.weights.relevance'), 0.65)
+    
+    def test_deep_merge_overrides_nested_values(self):
+        """Test that nested overrides keep sibling defaults at every level"""
+        config = ConfigLoader(config_path='/nonexistent/path/config.yaml')
+        base = {'a': {'b': {'c': 1, 'd': 2}, 'e': 3}, 'f': 4}
+        
+        merged = config._deep_merge(base, {'a': {'b': {'c': 10}, 'g': 5}, 'f': {'h': 6}})
+        
+        self.assertEqual(merged, {'a': {'b': {'c': 10, 'd': 2}, 'e': 3, 'g': 5}, 'f': {'h': 6}})
 
 
 if __name__ == '__main__':
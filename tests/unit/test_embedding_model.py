@@ -1,10 +1,13 @@
 import os
 import tempfile
 import unittest
+from types import SimpleNamespace
 from unittest.mock import patch
 
 import numpy as np
+import torch
 
+import src.models.article_embedding_model as embedding_module
 from src.models.article_embedding_model import ArticleEmbeddingModel
 
 
@@ -12,11 +15,27 @@ class _FakeSentenceTransformer:
     def __init__(self, model_name):
         self.model_name = model_name
         self.device = None
+        self.half_precision = False
+        self.encode_calls = []
 
     def to(self, device):
         self.device = device
 
-    def encode(self, texts, convert_to_numpy=True, show_progress_bar=True):
+    def half(self):
+        self.half_precision = True
+
+    def encode(
+        self,
+        texts,
+        batch_size=32,
+        convert_to_numpy=True,
+        normalize_embeddings=False,
+        show_progress_bar=True,
+        device=None,
+    ):
+        self.encode_calls.append(
+            {"texts": list(texts), "batch_size": batch_size, "show_progress_bar": show_progress_bar}
+        )
         vectors = []
         for text in texts:
             text = text.lower()
@@ -30,7 +49,10 @@ class _FakeSentenceTransformer:
                     dtype=float,
                 )
             )
-        return np.vstack(vectors)
+        vectors = np.vstack(vectors)
+        if normalize_embeddings:
+            vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors
 
     def save(self, path):
         os.makedirs(path, exist_ok=True)
@@ -38,13 +60,31 @@ class _FakeSentenceTransformer:
             handle.write(self.model_name)
 
 
+class _QuantizableFakeSentenceTransformer(_FakeSentenceTransformer):
+    def __init__(self, model_name):
+        super().__init__(model_name)
+        torch.manual_seed(0)
+        self.transformer = SimpleNamespace(auto_model=torch.nn.Sequential(torch.nn.Linear(8, 8)))
+
+    def _first_module(self):
+        return self.transformer
+
+    def encode(self, texts, normalize_embeddings=False, **kwargs):
+        with torch.no_grad():
+            vectors = self.transformer.auto_model(torch.ones(len(texts), 8)).numpy()
+        if normalize_embeddings:
+            vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors
+
+
 class TestArticleEmbeddingModel(unittest.TestCase):
     def setUp(self):
-        sentence_transformer_patch = patch(
-            "src.models.article_embedding_model.SentenceTransformer",
-            side_effect=lambda model_name: _FakeSentenceTransformer(model_name),
+        sentence_transformer_patch = patch.object(
+            embedding_module,
+            "SentenceTransformer",
+            side_effect=_FakeSentenceTransformer,
         )
-        cuda_patch = patch("src.models.article_embedding_model.torch.cuda.is_available", return_value=False)
+        cuda_patch = patch.object(torch.cuda, "is_available", return_value=False)
         self.addCleanup(sentence_transformer_patch.stop)
         self.addCleanup(cuda_patch.stop)
         sentence_transformer_patch.start()
@@ -79,6 +119,98 @@ class TestArticleEmbeddingModel(unittest.TestCase):
         self.assertEqual(embeddings.shape[0], 2)
         self.assertTrue(np.all(np.isfinite(embeddings)))
 
+    def test_predict_returns_unit_length_float32(self):
+        embeddings = self.model.predict([self.sample_article, {"title": "Other", "abstract": "Text."}])
+
+        self.assertEqual(embeddings.dtype, np.float32)
+        np.testing.assert_allclose(np.linalg.norm(embeddings, axis=1), 1.0, rtol=1e-6)
+
+    def test_predict_encodes_all_articles_in_one_call(self):
+        articles = [
+            self.sample_article,
+            {"title": "Second", "abstract": "Another test."},
+            {"title": "Third", "abstract": "Machine learning again."},
+        ]
+
+        embeddings = self.model.predict(articles)
+
+        self.assertEqual(embeddings.shape[0], 3)
+        self.assertEqual(len(self.model.model.encode_calls), 1)
+        call = self.model.model.encode_calls[0]
+        self.assertEqual(call["texts"][1], "Second Another test.")
+        self.assertEqual(call["batch_size"], 64)
+        self.assertFalse(call["show_progress_bar"])
+
+    def test_duplicate_texts_are_encoded_once(self):
+        duplicate = dict(self.sample_article)
+        other = {"title": "Other", "abstract": "Different text."}
+
+        embeddings = self.model.predict([self.sample_article, other, duplicate])
+
+        self.assertEqual(embeddings.shape[0], 3)
+        self.assertEqual(len(self.model.model.encode_calls[0]["texts"]), 2)
+        np.testing.assert_array_equal(embeddings[0], embeddings[2])
+        self.assertFalse(np.array_equal(embeddings[0], embeddings[1]))
+
+    def test_repeated_texts_are_served_from_cache(self):
+        other = {"title": "Other", "abstract": "Different text."}
+
+        first = self.model.predict([self.sample_article, other])
+        second = self.model.predict([other, self.sample_article])
+
+        self.assertEqual(len(self.model.model.encode_calls), 1)
+        np.testing.assert_array_equal(first[0], second[1])
+        np.testing.assert_array_equal(first[1], second[0])
+
+    def test_cache_can_be_disabled(self):
+        model = ArticleEmbeddingModel(cache_size=0)
+
+        model.predict(self.sample_article)
+        model.predict(self.sample_article)
+
+        self.assertEqual(len(model.model.encode_calls), 2)
+
+    def test_exported_backend_requires_recent_sentence_transformers(self):
+        with patch.object(embedding_module.importlib.metadata, "version", return_value="2.2.2"):
+            with self.assertRaisesRegex(ValueError, r"herald\[onnx\]"):
+                ArticleEmbeddingModel(backend="onnx")
+
+    def test_unknown_backend_is_rejected(self):
+        with self.assertRaisesRegex(ValueError, "Unknown embedding backend"):
+            ArticleEmbeddingModel(backend="tensorrt")
+
+    def test_shared_returns_one_instance_per_settings(self):
+        self.addCleanup(ArticleEmbeddingModel._shared.clear)
+
+        first = ArticleEmbeddingModel.shared("all-MiniLM-L6-v2", batch_size=16)
+        second = ArticleEmbeddingModel.shared("all-MiniLM-L6-v2", batch_size=16)
+        other = ArticleEmbeddingModel.shared("all-MiniLM-L6-v2", batch_size=32)
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(other.batch_size, 32)
+
+    def test_quantize_on_cpu_swaps_linear_layers(self):
+        with patch.object(
+            embedding_module,
+            "SentenceTransformer",
+            side_effect=_QuantizableFakeSentenceTransformer,
+        ):
+            model = ArticleEmbeddingModel(quantize=True)
+
+        layer = model.model.transformer.auto_model[0]
+        self.assertIsInstance(layer, torch.ao.nn.quantized.dynamic.Linear)
+
+    def test_quantize_falls_back_when_embeddings_diverge(self):
+        with patch.object(
+            embedding_module,
+            "SentenceTransformer",
+            side_effect=_QuantizableFakeSentenceTransformer,
+        ), patch.object(ArticleEmbeddingModel, "_MIN_QUANTIZED_SIMILARITY", 1.01):
+            model = ArticleEmbeddingModel(quantize=True)
+
+        self.assertIsInstance(model.model.transformer.auto_model[0], torch.nn.Linear)
+
     def test_save_load(self):
         with tempfile.TemporaryDirectory() as temp_dir:
             save_path = os.path.join(temp_dir, "test_model")
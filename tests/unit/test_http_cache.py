@@ -0,0 +1,86 @@
+"""
+Tests for the test-suite HTTP response cache.
+"""
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import requests
+
+from tests.fixtures.http_cache import HTTPCache
+
+
+def _fake_response(status_code=200, content=b'<feed>ok</feed>'):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    response.headers['Content-Type'] = 'application/atom+xml'
+    response.headers['Content-Encoding'] = 'gzip'
+    response.url = 'https://export.arxiv.org/api/query'
+    return response
+
+
+class TestHTTPCache(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.directory = temp_dir.name
+    
+    def _install(self, fake_request):
+        # The fake stands in for the network underneath the cache
+        network = patch.object(requests.Session, 'request', fake_request)
+        network.start()
+        self.addCleanup(network.stop)
+        cache = HTTPCache(self.directory).install()
+        self.addCleanup(cache.uninstall)
+        return cache
+    
+    def test_repeated_request_is_replayed(self):
+        """Test the second identical request never reaches the network"""
+        calls = []
+        
+        def fake_request(session, method, url, **kwargs):
+            calls.append(url)
+            return _fake_response()
+        
+        self._install(fake_request)
+        first = requests.Session().get('https://export.arxiv.org/api/query', params={'q': 'graphs'})
+        second = requests.Session().get('https://export.arxiv.org/api/query', params={'q': 'graphs'})
+        
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second.headers['Content-Type'], 'application/atom+xml')
+        self.assertNotIn('Content-Encoding', second.headers)
+    
+    def test_recordings_persist_across_instances(self):
+        """Test a fresh cache over the same directory replays from disk"""
+        cache = self._install(lambda session, method, url, **kwargs: _fake_response())
+        requests.Session().post('https://api.example.org/batch', json={'ids': ['A']})
+        cache.uninstall()
+        
+        def offline(session, method, url, **kwargs):
+            raise AssertionError("network should not be used")
+        
+        self._install(offline)
+        response = requests.Session().post('https://api.example.org/batch', json={'ids': ['A']})
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'<feed>ok</feed>')
+    
+    def test_failed_responses_are_not_recorded(self):
+        """Test error responses are retried rather than replayed"""
+        calls = []
+        
+        def fake_request(session, method, url, **kwargs):
+            calls.append(url)
+            return _fake_response(status_code=503)
+        
+        self._install(fake_request)
+        requests.Session().get('https://api.example.org/paper')
+        requests.Session().get('https://api.example.org/paper')
+        
+        self.assertEqual(len(calls), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Tests for metadata processor.
+"""
+import unittest
+from datetime import datetime, timezone
+
+from src.data_processors.metadata_processor import MetadataProcessor
+
+
+class TestMetadataProcessor(unittest.TestCase):
+    def setUp(self):
+        self.processor = MetadataProcessor()
+        self.sample_metadata = {
+            'title': 'Test Paper',
+            'authors': ['Ada Lovelace', 'Alan Mathison Turing'],
+            'published': '2024-01-01T00:00:00Z',
+            'categories': [' CS.LG ', 'stat.ML'],
+        }
+
+    def test_process_updates_in_place_by_default(self):
+        """Test the input dict is processed and returned as-is"""
+        result = self.processor.process(self.sample_metadata)
+
+        self.assertIs(result, self.sample_metadata)
+        self.assertEqual(result['categories'], ['cs.lg', 'stat.ml'])
+        self.assertEqual(result['published'], '2024-01-01T00:00:00+00:00')
+        self.assertIn('processed_at', result)
+
+    def test_process_can_copy(self):
+        """Test inplace=False leaves the input untouched"""
+        result = self.processor.process(self.sample_metadata, inplace=False)
+
+        self.assertIsNot(result, self.sample_metadata)
+        self.assertEqual(self.sample_metadata['authors'], ['Ada Lovelace', 'Alan Mathison Turing'])
+        self.assertNotIn('processed_at', self.sample_metadata)
+
+    def test_process_uses_given_timestamp(self):
+        """Test a batch-level timestamp is stamped verbatim"""
+        result = self.processor.process(self.sample_metadata, processed_at='2024-02-02T00:00:00')
+
+        self.assertEqual(result['processed_at'], '2024-02-02T00:00:00')
+
+    def test_process_formats_datetime_objects(self):
+        """Test datetimes returned by arxiv are converted to ISO strings"""
+        published = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        result = self.processor.process({'published': published})
+
+        self.assertEqual(result['published'], '2024-01-01T00:00:00+00:00')
+
+    def test_process_date_leaves_unparseable_strings(self):
+        """Test strings that are not ISO dates pass through unchanged"""
+        self.assertEqual(self.processor._process_date('last tuesday'), 'last tuesday')
+        self.assertEqual(
+            self.processor._process_date('2024-03-05T10:00:00+02:00'),
+            '2024-03-05T10:00:00+02:00',
+        )
+
+    def test_process_authors(self):
+        """Test author names are split into their parts"""
+        result = self.processor.process(self.sample_metadata)
+
+        self.assertEqual(result['authors'][0], {
+            'full_name': 'Ada Lovelace',
+            'first_name': 'Ada',
+            'last_name': 'Lovelace',
+            'middle_names': '',
+        })
+        self.assertEqual(result['authors'][1]['middle_names'], 'Mathison')
+
+    def test_process_single_and_empty_author_names(self):
+        """Test one-word and blank author names keep empty parts"""
+        authors = self.processor._process_authors(['Plato', ''])
+
+        self.assertEqual(authors[0], {
+            'full_name': 'Plato', 'first_name': 'Plato', 'last_name': '', 'middle_names': '',
+        })
+        self.assertEqual(authors[1], {
+            'full_name': '', 'first_name': '', 'last_name': '', 'middle_names': '',
+        })
+
+    def test_invalid_input_raises(self):
+        """Test empty metadata is rejected"""
+        with self.assertRaises(ValueError):
+            self.processor.process({})
+
+
+if __name__ == '__main__':
+    unittest.main()
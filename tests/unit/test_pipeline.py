@@ -1,169 +1,169 @@
 """
 Tests for Herald pipeline.
 """
-import unittest
-from unittest.mock import Mock, patch, MagicMock
-from datetime import datetime, timedelta
-from src.pipeline import HeraldPipeline, _format_authors
-
-
-class TestHeraldPipeline(unittest.TestCase):
-    def setUp(self):
-        # Mock the components to avoid actual API calls and model loading
-        with patch('src.pipeline.ArxivScraper'), \
-             patch('src.pipeline.MetadataProcessor'), \
-             patch('src.pipeline.TextProcessor'), \
-             patch('src.pipeline.ArticleRanker'):
-            self.pipeline = HeraldPipeline()
-    
-    @patch('src.pipeline.ArxivScraper')
-    @patch('src.pipeline.MetadataProcessor')
-    @patch('src.pipeline.TextProcessor')
-    @patch('src.pipeline.ArticleRanker')
-    def test_pipeline_initialization(self, mock_ranker, mock_text, mock_meta, mock_scraper):
+import copy
+from datetime import datetime
+import json
+from types import MappingProxyType
+from unittest.mock import call
+
+import pytest
+
+from src.pipeline import _dumps_json, _format_authors
+
+# Fixed publication dates; the mocked ranker never compares them to the clock
+_RECENT = '2025-01-01T00:00:00'
+_OLD = '2024-09-23T00:00:00'
+
+SAMPLE_ARTICLES = [
+    {
+        'title': 'Test Paper 1',
+        'abstract': 'This is about machine learning',
+        'published': _RECENT,
+        'authors': ['Author 1']
+    },
+    {
+        'title': 'Test Paper 2',
+        'abstract': 'This is about deep learning',
+        'published': _OLD,
+        'authors': ['Author 2']
+    }
+]
+
+# Canned ranker output shared by every test; read-only so no test can alter it for the others
+_RANKED_RESULTS = (
+    (MappingProxyType({'title': 'Test Paper 1'}), 0.9),
+    (MappingProxyType({'title': 'Test Paper 2'}), 0.7),
+)
+
+# Shared text-processing result; a tuple so no test can mutate it for the others
+_PROCESSED = {'processed_words': ('test',)}
+
+
+def _identity(article, **kwargs):
+    """Pass-through stand-in for MetadataProcessor.process."""
+    return article
+
+
+EXISTING_ARTICLES = [
+    {'title': 'Paper 1', 'abstract': 'Abstract 1'},
+    {'title': 'Paper 2', 'abstract': 'Abstract 2'}
+]
+
+
+def _assert_pipeline_shape(pipeline, results, query, max_results, titles, scores):
+    """Check one search_and_rank run end to end, reading each mock's call list once."""
+    scrape_calls = pipeline.scraper.iter_articles.call_args_list
+    metadata_calls = pipeline.metadata_processor.process.call_args_list
+    rank_calls = pipeline.ranker.rank_articles.call_args_list
+    observed = (
+        [(c.kwargs['query'], c.kwargs['max_results']) for c in scrape_calls],
+        len(metadata_calls),
+        # Every article in a run is stamped with the same processing time
+        len({c.kwargs['processed_at'] for c in metadata_calls}),
+        [[a['title'] for a in c.kwargs['articles']] for c in rank_calls],
+        [score for _, score in results],
+    )
+    assert observed == ([(query, max_results)], len(titles), 1, [titles], scores)
+
+
+@pytest.fixture
+def wired_pipeline(pipeline):
+    """Pipeline whose mocked components return canned articles and rankings."""
+    pipeline.scraper.iter_articles.return_value = copy.deepcopy(SAMPLE_ARTICLES)
+    pipeline.scraper.get_article_by_id.return_value = {
+        'title': 'Test Paper',
+        'abstract': 'Test abstract',
+        'arxiv_id': '1234.5678'
+    }
+    # A stored return value: most tests only check what reaches the ranker by count
+    pipeline.metadata_processor.process.return_value = {
+        'title': 'Test Paper',
+        'abstract': 'Test abstract',
+    }
+    pipeline.text_processor.process.return_value = _PROCESSED
+    pipeline.ranker.rank_articles.return_value = _RANKED_RESULTS
+    return pipeline
+
+
+class TestHeraldPipeline:
+    def test_pipeline_initialization(self, patched_pipeline):
         """Test pipeline initializes all components"""
-        pipeline = HeraldPipeline()
+        pipeline, mocks = patched_pipeline
         
-        mock_scraper.assert_called_once()
-        mock_meta.assert_called_once()
-        mock_text.assert_called_once()
-        mock_ranker.assert_called_once()
+        for mock_class in mocks.values():
+            mock_class.assert_called_once()
+        assert pipeline.scraper is mocks['ArxivScraper'].return_value
+        assert pipeline.ranker is mocks['ArticleRanker'].return_value
+    
+    @pytest.mark.parametrize("method,args,kwargs,component,attribute,expected_call,expected_len", [
+        (
+            "search_and_rank", ("machine learning",), {"max_results": 10},
+            "scraper", "iter_articles",
+            call(query="machine learning", max_results=10, date_from=None, date_to=None),
+            2,
+        ),
+        (
+            "get_article_by_id", ("1234.5678",), {},
+            "scraper", "get_article_by_id",
+            call('1234.5678'),
+            None,
+        ),
+        (
+            "rank_existing_articles", (EXISTING_ARTICLES,), {"query": "test"},
+            "ranker", "rank_articles",
+            call(articles=EXISTING_ARTICLES, query="test", weights=None, top_k=None),
+            2,
+        ),
+    ])
+    def test_entry_points_delegate_to_components(
+        self, wired_pipeline, method, args, kwargs, component, attribute, expected_call, expected_len
+    ):
+        """Test each public entry point calls its component once with the expected arguments"""
+        result = getattr(wired_pipeline, method)(*args, **kwargs)
+        
+        assert getattr(getattr(wired_pipeline, component), attribute).call_args_list == [expected_call]
+        if expected_len is None:
+            assert result['title'] == 'Test Paper'
+        else:
+            assert len(result) == expected_len
     
-    @patch('src.pipeline.ArxivScraper')
-    @patch('src.pipeline.MetadataProcessor')
-    @patch('src.pipeline.TextProcessor')
-    @patch('src.pipeline.ArticleRanker')
-    def test_search_and_rank_integration(self, mock_ranker_class, mock_text_class, 
-                                         mock_meta_class, mock_scraper_class):
+    def test_search_and_rank_integration(self, wired_pipeline):
         """Test full search and rank pipeline"""
-        # Setup mocks
-        mock_scraper = Mock()
-        mock_scraper.search_articles.return_value = [
-            {
-                'title': 'Test Paper 1',
-                'abstract': 'This is about machine learning',
-                'published': datetime.utcnow().isoformat(),
-                'authors': ['Author 1']
-            },
-            {
-                'title': 'Test Paper 2',
-                'abstract': 'This is about deep learning',
-                'published': (datetime.utcnow() - timedelta(days=100)).isoformat(),
-                'authors': ['Author 2']
-            }
-        ]
-        mock_scraper_class.return_value = mock_scraper
+        # Pass-through so the ranker input can be checked article by article
+        wired_pipeline.metadata_processor.process.side_effect = _identity
+        results = wired_pipeline.search_and_rank("machine learning", max_results=10)
         
-        mock_meta_processor = Mock()
-        mock_meta_processor.process.side_effect = lambda x: x  # Pass through
-        mock_meta_class.return_value = mock_meta_processor
-        
-        mock_text_processor = Mock()
-        mock_text_processor.process.return_value = {'processed_words': ['test']}
-        mock_text_class.return_value = mock_text_processor
-        
-        mock_ranker = Mock()
-        mock_ranker.rank_articles.return_value = [
-            ({'title': 'Test Paper 1'}, 0.9),
-            ({'title': 'Test Paper 2'}, 0.7)
-        ]
-        mock_ranker_class.return_value = mock_ranker
-        
-        # Create pipeline and test
-        pipeline = HeraldPipeline()
-        results = pipeline.search_and_rank("machine learning", max_results=10)
-        
-        # Verify calls
-        mock_scraper.search_articles.assert_called_once_with(
+        _assert_pipeline_shape(
+            wired_pipeline, results,
             query="machine learning",
-            max_results=10
-        )
-        mock_ranker.rank_articles.assert_called_once()
-        
-        # Verify results
-        self.assertEqual(len(results), 2)
-        self.assertEqual(results[0][1], 0.9)
-    
-    @patch('src.pipeline.ArxivScraper')
-    @patch('src.pipeline.MetadataProcessor')
-    @patch('src.pipeline.TextProcessor')
-    @patch('src.pipeline.ArticleRanker')
-    def test_get_article_by_id(self, mock_ranker_class, mock_text_class,
-                               mock_meta_class, mock_scraper_class):
-        """Test getting article by ID"""
-        mock_scraper = Mock()
-        mock_scraper.get_article_by_id.return_value = {
-            'title': 'Test Paper',
-            'abstract': 'Test abstract',
-            'arxiv_id': '1234.5678'
-        }
-        mock_scraper_class.return_value = mock_scraper
-        
-        mock_meta_processor = Mock()
-        mock_meta_processor.process.side_effect = lambda x: x
-        mock_meta_class.return_value = mock_meta_processor
-        
-        mock_text_processor = Mock()
-        mock_text_processor.process.return_value = {'processed_words': ['test']}
-        mock_text_class.return_value = mock_text_processor
-        
-        mock_ranker_class.return_value = Mock()
-        
-        pipeline = HeraldPipeline()
-        article = pipeline.get_article_by_id('1234.5678')
-        
-        mock_scraper.get_article_by_id.assert_called_once_with('1234.5678')
-        self.assertEqual(article['title'], 'Test Paper')
-    
-    @patch('src.pipeline.ArxivScraper')
-    @patch('src.pipeline.MetadataProcessor')
-    @patch('src.pipeline.TextProcessor')
-    @patch('src.pipeline.ArticleRanker')
-    def test_rank_existing_articles(self, mock_ranker_class, mock_text_class,
-                                    mock_meta_class, mock_scraper_class):
-        """Test ranking existing articles without fetching"""
-        mock_ranker = Mock()
-        mock_ranker.rank_articles.return_value = [
-            ({'title': 'Paper 1'}, 0.8),
-            ({'title': 'Paper 2'}, 0.6)
-        ]
-        mock_ranker_class.return_value = mock_ranker
-        
-        mock_scraper_class.return_value = Mock()
-        mock_meta_class.return_value = Mock()
-        mock_text_class.return_value = Mock()
-        
-        pipeline = HeraldPipeline()
-        articles = [
-            {'title': 'Paper 1', 'abstract': 'Abstract 1'},
-            {'title': 'Paper 2', 'abstract': 'Abstract 2'}
-        ]
-        
-        results = pipeline.rank_existing_articles(articles, query="test")
-        
-        mock_ranker.rank_articles.assert_called_once_with(
-            articles=articles,
-            query="test",
-            weights=None
+            max_results=10,
+            titles=['Test Paper 1', 'Test Paper 2'],
+            scores=[0.9, 0.7],
         )
-        self.assertEqual(len(results), 2)
 
-    def test_format_authors_handles_processed_dicts(self):
-        """Test author formatting handles metadata-processed dict authors."""
-        authors = [
-            {'full_name': 'Alice Smith', 'first_name': 'Alice'},
-            {'full_name': 'Bob Jones', 'first_name': 'Bob'}
-        ]
-        formatted = _format_authors(authors)
-        self.assertEqual(formatted, "Alice Smith, Bob Jones")
 
-    def test_format_authors_handles_string_authors(self):
-        """Test author formatting handles original string author lists."""
-        authors = ['Alice Smith', 'Bob Jones']
-        formatted = _format_authors(authors)
-        self.assertEqual(formatted, "Alice Smith, Bob Jones")
+def test_format_authors_handles_processed_dicts():
+    """Test author formatting handles metadata-processed dict authors."""
+    authors = [
+        {'full_name': 'Alice Smith', 'first_name': 'Alice'},
+        {'full_name': 'Bob Jones', 'first_name': 'Bob'}
+    ]
+    formatted = _format_authors(authors)
+    assert formatted == "Alice Smith, Bob Jones"
+
 
+def test_format_authors_handles_string_authors():
+    """Test author formatting handles original string author lists."""
+    authors = ['Alice Smith', 'Bob Jones']
+    formatted = _format_authors(authors)
+    assert formatted == "Alice Smith, Bob Jones"
 
-if __name__ == '__main__':
-    unittest.main()
 
+def test_dumps_json_handles_datetimes():
+    """Test JSON output serializes datetimes and plain values"""
+    output = [{'article': {'published': datetime(2024, 1, 1), 'title': 'A'}, 'score': 0.5}]
+    data = json.loads(_dumps_json(output))
+    assert data[0]['article']['title'] == 'A'
+    assert data[0]['article']['published'].startswith('2024-01-01')
+    assert data[0]['score'] == 0.5
@@ -1,11 +1,24 @@
 import unittest
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
+from unittest.mock import patch
 
 import numpy as np
+import pytest
 
+from src.models.article_embedding_model import ArticleEmbeddingModel
 from src.ranking_engine.ranker import ArticleRanker
 from src.utils.config_loader import ConfigLoader
 
+# Reference time passed to the recency tests, so scores of the fixed dates below are exact
+_NOW = datetime(2025, 1, 1, tzinfo=timezone.utc).timestamp()
+_TODAY = "2025-01-01T00:00:00+00:00"
+_YESTERDAY = "2024-12-31T00:00:00+00:00"
+_THREE_DAYS_AGO = "2024-12-29T00:00:00+00:00"
+_LAST_WEEK = "2024-12-25T00:00:00+00:00"
+_TWO_WEEKS_AGO = "2024-12-18T00:00:00+00:00"
+_LONG_AGO = "2022-07-16T00:00:00+00:00"
+_DAYS_AGO = (_TODAY, _YESTERDAY, "2024-12-30T00:00:00+00:00", _THREE_DAYS_AGO)
+
 
 class _FakeEmbeddingModel:
     _DIMENSIONS = [
@@ -29,6 +42,15 @@ class _FakeEmbeddingModel:
         return np.array([float(text.count(token)) for token in self._DIMENSIONS], dtype=float)
 
 
+class _CountingEmbeddingModel(_FakeEmbeddingModel):
+    def __init__(self):
+        self.calls = 0
+
+    def predict(self, articles):
+        self.calls += 1
+        return super().predict(articles)
+
+
 class _FailingEmbeddingModel:
     def predict(self, articles):
         raise RuntimeError("embedding backend unavailable")
@@ -38,23 +60,39 @@ class _FakeCitationFetcher:
     def get_citation_count(self, article):
         return article.get("citation_count")
 
+    def fetch_all(self, articles):
+        return [self.get_citation_count(article) for article in articles]
+
+
+# Stateless, so every ranker in this module shares one instance
+_CITATION_FETCHER = _FakeCitationFetcher()
+
 
 class TestArticleRanker(unittest.TestCase):
-    def setUp(self):
-        self.config = ConfigLoader(config_path="/definitely/missing.yaml")
-        self.config.config["citation"]["enabled"] = True
-        self.config.config["ranking"]["weights"] = {
+    @classmethod
+    def setUpClass(cls):
+        # Config and the default ranker are read-only in these tests, so build them once
+        cls.config = ConfigLoader(config_path="/definitely/missing.yaml")
+        cls.config.config["citation"]["enabled"] = True
+        cls.config.config["ranking"]["weights"] = {
             "relevance": 0.65,
             "recency": 0.2,
             "citations": 0.1,
             "quality": 0.05,
         }
+        cls.ranker = ArticleRanker(
+            embedding_model=_FakeEmbeddingModel(),
+            config=cls.config,
+            citation_fetcher=_CITATION_FETCHER,
+        )
 
     def _build_ranker(self, embedding_model=None):
+        if embedding_model is None:
+            return self.ranker
         return ArticleRanker(
-            embedding_model=embedding_model or _FakeEmbeddingModel(),
+            embedding_model=embedding_model,
             config=self.config,
-            citation_fetcher=_FakeCitationFetcher(),
+            citation_fetcher=_CITATION_FETCHER,
         )
 
     def test_rank_articles_empty(self):
@@ -63,18 +101,17 @@ class TestArticleRanker(unittest.TestCase):
 
     def test_exact_title_phrase_beats_loose_semantic_match(self):
         ranker = self._build_ranker()
-        now = datetime.now(timezone.utc)
         articles = [
             {
                 "title": "Graph Neural Networks for Molecular Property Prediction",
                 "abstract": "Graph neural networks improve molecular reasoning with graph structure.",
-                "published": (now - timedelta(days=7)).isoformat(),
+                "published": _LAST_WEEK,
                 "citation_count": 15,
             },
             {
                 "title": "Neural Networks for Molecular Property Prediction",
                 "abstract": "A broad neural architecture without graph-specific modeling.",
-                "published": (now - timedelta(days=1)).isoformat(),
+                "published": _YESTERDAY,
                 "citation_count": 25,
             },
         ]
@@ -90,18 +127,17 @@ class TestArticleRanker(unittest.TestCase):
 
     def test_lexical_fallback_still_ranks_when_embeddings_fail(self):
         ranker = self._build_ranker(embedding_model=_FailingEmbeddingModel())
-        now = datetime.now(timezone.utc)
         articles = [
             {
                 "title": "Scaling Laws for Diffusion Models",
                 "abstract": "Diffusion models exhibit predictable scaling behavior.",
-                "published": (now - timedelta(days=14)).isoformat(),
+                "published": _TWO_WEEKS_AGO,
                 "citation_count": 2,
             },
             {
                 "title": "Vision Transformers for Medical Imaging",
                 "abstract": "A recent paper with little relation to diffusion.",
-                "published": (now - timedelta(days=1)).isoformat(),
+                "published": _YESTERDAY,
                 "citation_count": 90,
             },
         ]
@@ -114,18 +150,17 @@ class TestArticleRanker(unittest.TestCase):
 
     def test_no_query_rebalances_to_browse_features(self):
         ranker = self._build_ranker()
-        now = datetime.now(timezone.utc)
         articles = [
             {
                 "title": "Fresh Paper",
                 "abstract": "This abstract is fairly detailed and recent." * 10,
-                "published": (now - timedelta(days=3)).isoformat(),
+                "published": _THREE_DAYS_AGO,
                 "citation_count": 20,
             },
             {
                 "title": "Old Paper",
                 "abstract": "Short abstract.",
-                "published": (now - timedelta(days=900)).isoformat(),
+                "published": _LONG_AGO,
                 "citation_count": 20,
             },
         ]
@@ -141,7 +176,7 @@ class TestArticleRanker(unittest.TestCase):
         article = {
             "title": "Graph Neural Networks",
             "abstract": "Graph neural networks are useful for relational learning." * 8,
-            "published": datetime.now(timezone.utc).isoformat(),
+            "published": _TODAY,
             "citation_count": 500,
         }
 
@@ -154,6 +189,84 @@ class TestArticleRanker(unittest.TestCase):
         self.assertGreaterEqual(ranked[0][1], 0.0)
         self.assertLessEqual(ranked[0][1], 1.0)
 
+    def test_articles_are_embedded_in_one_batch(self):
+        model = _CountingEmbeddingModel()
+        ranker = self._build_ranker(embedding_model=model)
+        articles = [
+            {"title": "Graph Neural Networks", "abstract": "Graph models."},
+            {"title": "Diffusion Models", "abstract": "Vision diffusion."},
+            {"title": "Language Models", "abstract": "Language model scaling."},
+        ]
+
+        ranked = ranker.rank_articles(articles, query="graph neural networks")
+
+        self.assertEqual(model.calls, 2)
+        self.assertEqual(ranked[0][0]["title"], "Graph Neural Networks")
+        for article, _ in ranked:
+            similarity = article["ranking_features"]["semantic_similarity"]
+            self.assertGreaterEqual(similarity, 0.0)
+            self.assertLessEqual(similarity, 1.0)
+
+    def test_embeddings_are_contiguous_unit_float32(self):
+        ranker = self._build_ranker()
+        embeddings = ranker._predict_embeddings(
+            [{"title": "Graph Neural Networks", "abstract": ""}, {"title": "Vision", "abstract": ""}]
+        )
+
+        self.assertEqual(embeddings.dtype, np.float32)
+        self.assertTrue(embeddings.flags["C_CONTIGUOUS"])
+        np.testing.assert_allclose(np.linalg.norm(embeddings, axis=1), 1.0, rtol=1e-6)
+
+    def test_default_embedding_model_loads_on_first_use(self):
+        with patch.object(ArticleEmbeddingModel, "shared", return_value=_FakeEmbeddingModel()) as shared:
+            ranker = ArticleRanker(config=self.config, citation_fetcher=_CITATION_FETCHER)
+            self.assertFalse(shared.called)
+
+            ranker.rank_articles([{"title": "Graph Neural Networks", "abstract": ""}], query="graph")
+            ranker.rank_articles([{"title": "Vision", "abstract": ""}], query="vision")
+
+        shared.assert_called_once()
+
+    def test_model_load_failure_falls_back_to_lexical_once(self):
+        articles = [
+            {"title": "Scaling Laws for Diffusion Models", "abstract": "Diffusion scaling."},
+            {"title": "Vision Transformers", "abstract": "Medical imaging."},
+        ]
+        with patch.object(ArticleEmbeddingModel, "shared", side_effect=OSError("offline")) as shared:
+            ranker = ArticleRanker(config=self.config, citation_fetcher=_CITATION_FETCHER)
+            with self.assertLogs("src.ranking_engine.ranker", level="WARNING"):
+                first = ranker.rank_articles([dict(a) for a in articles], query="diffusion scaling")
+            second = ranker.rank_articles([dict(a) for a in articles], query="diffusion")
+
+        shared.assert_called_once()
+        self.assertEqual(first[0][0]["title"], articles[0]["title"])
+        self.assertEqual(second[0][0]["ranking_features"]["semantic_similarity"], 0.0)
+
+    def test_embedding_model_can_be_replaced(self):
+        ranker = self._build_ranker(embedding_model=_FailingEmbeddingModel())
+        model = _FakeEmbeddingModel()
+
+        ranker.embedding_model = model
+
+        self.assertIs(ranker.embedding_model, model)
+
+    def test_config_changes_apply_to_existing_ranker(self):
+        config = ConfigLoader(config_path="/definitely/missing.yaml")
+        config.set("citation.enabled", True)
+        ranker = ArticleRanker(
+            embedding_model=_FakeEmbeddingModel(),
+            config=config,
+            citation_fetcher=_CITATION_FETCHER,
+        )
+        article = {"title": "Graph Networks", "abstract": "", "citation_count": 50}
+
+        before = ranker.rank_articles([dict(article)])[0][0]["ranking_features"]["citations"]
+        config.set("citation.enabled", False)
+        after = ranker.rank_articles([dict(article)])[0][0]["ranking_features"]["citations"]
+
+        self.assertGreater(before, 0.0)
+        self.assertEqual(after, 0.0)
+
     def test_cached_citations_are_normalized(self):
         ranker = self._build_ranker()
         score = ranker._calculate_citation_score({"citation_count": 500})
@@ -164,10 +277,99 @@ class TestArticleRanker(unittest.TestCase):
     def test_recency_score_supports_datetime_input(self):
         ranker = self._build_ranker()
         score = ranker._calculate_recency_score(
-            {"published": datetime.now(timezone.utc) - timedelta(days=30)}
+            {"published": datetime(2024, 12, 2, tzinfo=timezone.utc)},
+            now=_NOW,
         )
-        self.assertGreaterEqual(score, 0.0)
-        self.assertLessEqual(score, 1.0)
+        self.assertAlmostEqual(score, np.exp(-30 / ranker._recency_decay_days))
+
+    def test_recency_scores_handle_missing_and_invalid_dates(self):
+        ranker = self._build_ranker()
+        scores = ranker._calculate_recency_scores(
+            [
+                {"published": _YESTERDAY},
+                {"published": "2020-01-01T00:00:00Z"},
+                {"published": "not a date"},
+                {},
+            ],
+            now=_NOW,
+        )
+
+        self.assertEqual(scores.shape, (4,))
+        self.assertAlmostEqual(scores[0], np.exp(-1 / ranker._recency_decay_days))
+        self.assertAlmostEqual(scores[1], np.exp(-1827 / ranker._recency_decay_days))
+        self.assertEqual(scores[2], 0.0)
+        self.assertEqual(scores[3], 0.0)
+
+    def test_citation_scores_are_log_scaled_and_clipped(self):
+        ranker = self._build_ranker()
+        scores = ranker._calculate_citation_scores(
+            [{"citation_count": 0}, {"citation_count": 10}, {"citation_count": 10**9}, {}]
+        )
+
+        self.assertEqual(scores[0], 0.0)
+        self.assertGreater(scores[1], 0.0)
+        self.assertEqual(scores[2], 1.0)
+        self.assertEqual(scores[3], 0.0)
+
+    def test_top_k_matches_head_of_full_ranking(self):
+        ranker = self._build_ranker()
+        articles = [
+            {
+                "id": index,
+                "title": f"Paper {index % 5}",
+                "abstract": "graph neural networks " * (index % 3),
+                "published": _DAYS_AGO[index % 4],
+                "citation_count": index % 2,
+            }
+            for index in range(20)
+        ]
+
+        full = ranker.rank_articles([dict(a) for a in articles], query="graph networks")
+        top = ranker.rank_articles([dict(a) for a in articles], query="graph networks", top_k=3)
+
+        self.assertEqual(len(top), 3)
+        self.assertEqual([a["id"] for a, _ in top], [a["id"] for a, _ in full[:3]])
+        for (_, top_score), (_, full_score) in zip(top, full):
+            self.assertAlmostEqual(top_score, full_score)
+
+
+@pytest.mark.slow
+class TestArticleRankerWithRealModel(unittest.TestCase):
+    """End-to-end ranking with the real sentence-transformer; run with -m slow."""
+
+    @classmethod
+    def setUpClass(cls):
+        config = ConfigLoader(config_path="/definitely/missing.yaml")
+        try:
+            embedding_model = ArticleEmbeddingModel.shared(model_name=config.get_embedding_model_name())
+        except Exception as exc:
+            raise unittest.SkipTest(f"embedding model unavailable: {exc}")
+        cls.ranker = ArticleRanker(
+            embedding_model=embedding_model,
+            config=config,
+            citation_fetcher=_CITATION_FETCHER,
+        )
+
+    def test_semantic_match_ranks_first(self):
+        published = _TODAY
+        articles = [
+            {
+                "id": "off-topic",
+                "title": "Coral reef bleaching under rising ocean temperatures",
+                "abstract": "We survey reef ecosystems across the Pacific.",
+                "published": published,
+            },
+            {
+                "id": "on-topic",
+                "title": "Message passing networks for molecules",
+                "abstract": "Graph neural networks predict molecular properties from atom graphs.",
+                "published": published,
+            },
+        ]
+
+        ranked = self.ranker.rank_articles(articles, query="graph neural networks")
+
+        self.assertEqual(ranked[0][0]["id"], "on-topic")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,136 @@
+"""
+Tests for text processor.
+"""
+import re
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import nltk.tokenize
+
+import src.data_processors.text_processor as text_module
+from src.data_processors.text_processor import TextProcessor
+
+_STOP_WORDS = frozenset({'the', 'a', 'of'})
+
+
+class _CountingLemmatizer:
+    """Strips a plural 's' and counts how often it is asked."""
+
+    def __init__(self):
+        self.calls = []
+
+    def lemmatize(self, word):
+        self.calls.append(word)
+        return word[:-1] if word.endswith('s') else word
+
+
+def _split_tokenize(self, text):
+    """Stand-in for _tokenize: one sentence, whitespace-split lowercase words."""
+    return [text], text.lower().split()
+
+
+class TestTextProcessor(unittest.TestCase):
+    def setUp(self):
+        self.lemmatizer = _CountingLemmatizer()
+        # Default resources come from the fakes, so no NLTK data is needed
+        for patcher in (
+            patch.object(text_module, '_ensure_nltk', return_value=()),
+            patch.object(text_module, '_english_stop_words', return_value=_STOP_WORDS),
+            patch.object(text_module, '_shared_lemmatizer', return_value=self.lemmatizer),
+            patch.object(text_module, '_LEMMATIZER', self.lemmatizer),
+            patch.object(TextProcessor, '_tokenize', _split_tokenize),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        # Keep fake lemmas out of the process-wide memo
+        text_module._normalize_token.cache_clear()
+        self.addCleanup(text_module._normalize_token.cache_clear)
+
+        self.processor = TextProcessor()
+
+    def test_default_settings_drop_stop_words_and_lemmatize(self):
+        """Test the default stop words and lemmatizer are applied"""
+        result = self.processor.process('The graphs of networks')
+
+        self.assertEqual(result['processed_words'], ['graph', 'network'])
+        self.assertEqual(result['word_count'], 2)
+
+    def test_repeated_tokens_hit_the_shared_memo(self):
+        """Test each distinct token is lemmatized once across default processors"""
+        self.processor.process('graphs graphs networks')
+        TextProcessor().process('networks graphs')
+
+        self.assertEqual(sorted(self.lemmatizer.calls), ['graphs', 'networks'])
+
+    def test_custom_stop_words_take_effect(self):
+        """Test assigned stop words replace the defaults and reset the memo"""
+        self.processor.process('the graphs')
+        self.processor.stop_words = ['graphs']
+
+        result = self.processor.process('the graphs')
+
+        self.assertEqual(result['processed_words'], ['the'])
+        self.assertIsNot(self.processor._normalize_token, text_module._normalize_token)
+
+    def test_custom_lemmatizer_takes_effect(self):
+        """Test an assigned lemmatizer is used instead of the shared one"""
+        self.processor.process('graphs')
+        self.processor.lemmatizer = SimpleNamespace(lemmatize=str.upper)
+
+        result = self.processor.process('graphs')
+
+        self.assertEqual(result['processed_words'], ['GRAPHS'])
+
+    def test_custom_settings_leave_other_processors_alone(self):
+        """Test one processor's settings never leak into the shared memo"""
+        self.processor.stop_words = ['graphs']
+        self.processor.process('graphs')
+
+        result = TextProcessor().process('graphs')
+
+        self.assertEqual(result['processed_words'], ['graph'])
+
+    def test_clean_text_matches_two_pass_regex(self):
+        """Test the single compiled pass matches the original per-character cleanup"""
+        samples = [
+            'Graph  neural\tnetworks (GNNs): a survey!',
+            '  Résumé — naïve   café, 3.5% faster…  ',
+            'x^2 + y^2 = z^2; see [1], [2].',
+            '',
+        ]
+        for text in samples:
+            expected = re.sub(r'\s+', ' ', re.sub(r'[^\w\s.]', ' ', text)).strip()
+            self.assertEqual(self.processor._clean_text(text), expected)
+
+
+class TestTokenize(unittest.TestCase):
+    def setUp(self):
+        self.processor = TextProcessor()
+
+    def test_uses_blingfire_when_installed(self):
+        """Test blingfire splits sentences and words when available"""
+        fake_blingfire = SimpleNamespace(
+            text_to_sentences=lambda text: 'One. \nTwo.\n',
+            text_to_words=lambda text: 'one . two .',
+        )
+        with patch.object(text_module, 'blingfire', fake_blingfire):
+            sentences, words = self.processor._tokenize('One. Two.')
+
+        self.assertEqual(sentences, ['One. ', 'Two.'])
+        self.assertEqual(words, ['one', '.', 'two', '.'])
+
+    def test_falls_back_to_nltk(self):
+        """Test NLTK tokenizers are used on lowercased text without blingfire"""
+        with patch.object(text_module, 'blingfire', None), \
+                patch.object(nltk.tokenize, 'sent_tokenize', return_value=['One.']) as sent_tokenize, \
+                patch.object(nltk.tokenize, 'word_tokenize', return_value=['one', '.']) as word_tokenize:
+            sentences, words = self.processor._tokenize('One.')
+
+        self.assertEqual((sentences, words), (['One.'], ['one', '.']))
+        sent_tokenize.assert_called_once_with('One.')
+        word_tokenize.assert_called_once_with('one.')
+
+
+if __name__ == '__main__':
+    unittest.main()
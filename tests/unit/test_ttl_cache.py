@@ -0,0 +1,46 @@
+"""
+Tests for the TTL cache.
+"""
+import time
+import unittest
+from unittest.mock import patch
+
+from src.utils.ttl_cache import TTLCache
+
+
+class TestTTLCache(unittest.TestCase):
+    def test_get_returns_default_on_miss(self):
+        """Test missing keys return the default"""
+        cache = TTLCache(maxsize=2)
+        self.assertIsNone(cache.get('missing'))
+        self.assertEqual(cache.get('missing', 'fallback'), 'fallback')
+
+    def test_evicts_least_recently_used(self):
+        """Test the least recently used entry is evicted first"""
+        cache = TTLCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+
+    @patch.object(time, 'monotonic')
+    def test_entries_expire_after_ttl(self, mock_monotonic):
+        """Test entries are dropped once their TTL has passed"""
+        cache = TTLCache(maxsize=2, ttl=10)
+        mock_monotonic.return_value = 100.0
+        cache.set('a', 1)
+
+        mock_monotonic.return_value = 105.0
+        self.assertEqual(cache.get('a'), 1)
+
+        mock_monotonic.return_value = 111.0
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()